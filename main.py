@@ -22,6 +22,13 @@ def main():
     parser.add_argument("-b", "--bench", dest="bench", action="store_true",
                         help="enable benchmark data log."
                              "Default: False")
+    parser.add_argument("-d", "--dump-intermediates", dest="dump_intermediates", action="store_true",
+                        help="store the Esprima AST of each page under <output>/intermediate-data."
+                             "Default: False")
+    parser.add_argument("-p", "--pdg-cache", dest="pdg_cache", action="store_true",
+                        help="reuse the PDG of the pages whose js file did not change since a previous run, "
+                             "cached under <output>/pdg-cache."
+                             "Default: False")
 
     args = parser.parse_args()
     input_path = args.input
@@ -29,6 +36,8 @@ def main():
     config_path = args.config
     workers = args.workers
     bench = args.bench
+    dump_intermediates = args.dump_intermediates
+    pdg_cache = args.pdg_cache
 
     # test config
     config = None
@@ -48,10 +57,12 @@ def main():
             # handle index files
             with open(input_path) as f:
                 for i in f.readlines():
-                    taintmini.analyze_mini_program(str.strip(i), output_path, config, workers, bench)
+                    taintmini.analyze_mini_program(str.strip(i), output_path, config, workers, bench,
+                                                   dump_intermediates, pdg_cache)
         elif os.path.isdir(input_path):
             # handle single mini program
-            taintmini.analyze_mini_program(input_path, output_path, config, workers, bench)
+            taintmini.analyze_mini_program(input_path, output_path, config, workers, bench, dump_intermediates,
+                                           pdg_cache)
     else:
         print(f"[main] error: invalid input path")
 
@@ -45,6 +45,7 @@ def get_extended_ast(input_file, json_path, remove_json=False):
             Path of the file to produce an AST from.
         - json_path: str
             Path of the JSON file to temporary store the AST in.
+            Or None to get the AST from Esprima's stdout, without writing it on disk.
         - remove_json: bool
             Indicates whether to remove or not the JSON file containing the Esprima AST.
             Default: True.
@@ -59,7 +60,7 @@ def get_extended_ast(input_file, json_path, remove_json=False):
 
     try:
         produce_ast = subprocess.run(['node', os.path.join(SRC_PATH, 'parser.js'),
-                                      input_file, json_path],
+                                      input_file, json_path if json_path is not None else '1'],
                                      stdout=subprocess.PIPE, check=True)
     except subprocess.CalledProcessError:
         logging.critical('Esprima parsing error for %s', input_file)
@@ -67,10 +68,13 @@ def get_extended_ast(input_file, json_path, remove_json=False):
 
     if produce_ast.returncode == 0:
 
-        with open(json_path) as json_data:
-            esprima_ast = json.loads(json_data.read())
-        if remove_json:
-            os.remove(json_path)
+        if json_path is None:
+            esprima_ast = json.loads(produce_ast.stdout)
+        else:
+            with open(json_path) as json_data:
+                esprima_ast = json.loads(json_data.read())
+            if remove_json:
+                os.remove(json_path)
 
         extended_ast = _extended_ast.ExtendedAst()
         extended_ast.filename = input_file
@@ -34,6 +34,7 @@ from . import control_flow
 from . import data_flow
 from . import scope as _scope
 from . import display_graph
+from . import js_operators
 
 # Builds the JS code from the AST, or not, to check for possible bugs in the AST building process.
 CHECK_JSON = utility_df.CHECK_JSON
@@ -80,7 +81,7 @@ def get_data_flow_process(js_path, benchmarks, store_pdgs):
 
 def get_data_flow(input_file, benchmarks, store_pdgs=None, check_var=False, beautiful_print=False,
                   save_path_ast=False, save_path_cfg=False, save_path_pdg=False,
-                  check_json=CHECK_JSON, alt_json_path=None):
+                  check_json=CHECK_JSON, alt_json_path=None, store_json=True):
     """
         Builds the PDG: enhances the AST with CF, DF, and pointer analysis for a given file.
 
@@ -103,6 +104,10 @@ def get_data_flow(input_file, benchmarks, store_pdgs=None, check_var=False, beau
             Whether to beautiful print the AST or not.
         - check_json: bool
             Builds the JS code from the AST, or not, to check for bugs in the AST building process.
+        - alt_json_path: str
+            Path of the folder to store Esprima's JSON AST in, instead of next to input_file.
+        - store_json: bool
+            Whether to store Esprima's JSON AST on disk, or only pass it through a pipe.
 
         -------
         Returns:
@@ -114,16 +119,17 @@ def get_data_flow(input_file, benchmarks, store_pdgs=None, check_var=False, beau
 
     start = timeit.default_timer()
     utility_df.limit_memory(20*10**9)  # Limiting the memory usage to 20GB
+    js_operators.clear_caches()  # Do not keep the previous PDG alive
     if input_file.endswith('.js'):
         esprima_json = input_file.replace('.js', '.json')
     else:
         esprima_json = input_file + '.json'
 
     if alt_json_path is not None:
-        if not os.path.exists(alt_json_path):
+        if store_json and not os.path.exists(alt_json_path):
             os.mkdir(alt_json_path)
         esprima_json = os.path.join(alt_json_path, esprima_json[1:])
-    extended_ast = build_ast.get_extended_ast(input_file, esprima_json)
+    extended_ast = build_ast.get_extended_ast(input_file, esprima_json if store_json else None)
 
     benchmarks['errors'] = []
 
@@ -144,6 +150,7 @@ def get_data_flow(input_file, benchmarks, store_pdgs=None, check_var=False, beau
             display_graph.draw_ast(ast_nodes, attributes=True, save_path=save_path_ast)
 
         cfg_nodes = control_flow.control_flow(ast_nodes)
+        cfg_nodes.freeze()  # Children and statement dependencies are final from now on
         benchmarks['CFG'] = timeit.default_timer() - start
         start = utility_df.micro_benchmark('Successfully produced the CFG in',
                                            timeit.default_timer() - start)
@@ -36,7 +36,7 @@ def link_expression(node, node_parent):
 def epsilon_statement_cf(node):
     """ Non-conditional statements. """
     for child in node.children:
-        if isinstance(child, _node.Statement):
+        if child.kind == _node.KIND_STMT:
             node.set_control_dependency(extremity=child, label='e')
         else:
             link_expression(node=child, node_parent=node)
@@ -186,10 +186,11 @@ def control_flow(ast_nodes):
     """
 
     for child in ast_nodes.children:
-        if child.name in _node.EPSILON or child.name in _node.UNSTRUCTURED:
-            epsilon_statement_cf(child)
-        elif child.name in _node.CONDITIONAL:
-            conditional_statement_cf(child)
+        if child.kind == _node.KIND_STMT:  # STATEMENTS = EPSILON | CONDITIONAL | UNSTRUCTURED
+            if child.name in _node.CONDITIONAL:
+                conditional_statement_cf(child)
+            else:
+                epsilon_statement_cf(child)
         else:
             for grandchild in child.children:
                 link_expression(node=grandchild, node_parent=child)
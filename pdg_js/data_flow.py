@@ -39,6 +39,8 @@ PDG_EXCEPT = utility_df.PDG_EXCEPT
 LIMIT_RETRAVERSE = utility_df.LIMIT_RETRAVERSE
 # If iterating through a loop, then max times to avoid infinite loops
 LIMIT_LOOP = utility_df.LIMIT_LOOP
+# To display the variables' value or not, checked before calling display_values
+DISPLAY_VAR = utility_df.DISPLAY_VAR
 
 """
 In the following,
@@ -196,7 +198,7 @@ def search_identifiers(node, id_list, tab, rec=True):
         """
         if node.parent.name == 'MemberExpression':
             if node.parent.children[0] == node:  # left member
-                if get_node_computed_value(node) in _node.GLOBAL_VAR:  # do nothing if window &co
+                if _node.is_global_var(get_node_computed_value(node)):  # do nothing if window &co
                     id_list.append(node.id)  # As GLOBAL_VAR are still Identifiers
                     logging.debug('%s is not the variable\'s name', node.attributes['name'])
 
@@ -205,9 +207,10 @@ def search_identifiers(node, id_list, tab, rec=True):
 
             elif node.parent.children[1] == node:  # right member
                 if node.parent.children[0].name == 'ThisExpression'\
-                        or get_node_computed_value(node.parent.children[0]) in _node.GLOBAL_VAR:
+                        or _node.is_global_var(get_node_computed_value(node.parent.children[0])):
                     # left member is not a valid Identifier, what about right member?
-                    if get_node_computed_value(node) in _node.GLOBAL_VAR:  # ignore right member too
+                    # ignore right member too
+                    if _node.is_global_var(get_node_computed_value(node)):
                         id_list.append(node.id)  # As GLOBAL_VAR are still Identifiers
                         logging.debug('%s is not the variable\'s name', node.attributes['name'])
 
@@ -398,7 +401,8 @@ def update_expr_df(node, scopes, id_list, entry):
         var_decl_df(node=argument, scopes=scopes, assignt=True, entry=entry)
         assignment_df(identifier_node=argument, scopes=scopes)
         compute_update_expression(node, argument)
-        display_values(var=argument, keep_none=False)  # Display values
+        if DISPLAY_VAR:
+            display_values(var=argument, keep_none=False)  # Display values
 
     if not arguments:
         logging.warning('No identifier assignee found')
@@ -987,7 +991,8 @@ def build_dfg_content(child, scopes, id_list, entry):
             handle_foreach(node=child)  # Sets provenance for forEach constructs
             handle_push(node=child)  # Sets provenance for push constructs
 
-        display_values(var=child, keep_none=False, recompute=False)  # Display values
+        if DISPLAY_VAR:
+            display_values(var=child, keep_none=False, recompute=False)  # Display values
 
     ################################################################################################
 
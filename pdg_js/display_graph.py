@@ -25,36 +25,64 @@
     Display graphs (AST, CFG, PDG) using the graphviz library.
 """
 
+import shutil
+import subprocess
+import sys
+from itertools import chain
+
 import graphviz
 
 from . import node as _node
 
+LEAF_NODE_STYLE = {'style': 'filled', 'color': 'lightgoldenrodyellow',
+                   'fillcolor': 'lightgoldenrodyellow'}
+LEAF_EDGE_STYLE = {'color': 'orange'}
+EDGE_COLORS = {'data': 'green', 'param': 'seagreen'}
+
+_DOT = shutil.which('dot')  # Resolved once, instead of at each graphviz.render call
+
+
+def leaf_label(node_attributes):
+    """ Interned string representation of a leaf's attributes. """
 
-def append_leaf_attr(node, graph):
+    return sys.intern(str(node_attributes))  # Labels repeat a lot, e.g., variable names
+
+
+def append_leaves_attr(leaves, graph):
     """
-        Append the leaf's attribute to the graph in graphviz format.
+        Append the leaves' attributes to the graph in graphviz format, after the traversal so
+        that the leaf style is only set once.
 
         -------
         Parameters:
-        - node: Node
-            Node.
+        - leaves: list of Node
+            Nodes collected during the traversal, only the actual leaves are drawn.
         - graph: Digraph/Graph
             Graph object. Be careful it is mutable.
     """
 
-    if node.is_leaf():
-        leaf_id = str(node.id) + 'leaf_'
-        graph.attr('node', style='filled', color='lightgoldenrodyellow',
-                   fillcolor='lightgoldenrodyellow')
-        graph.attr('edge', color='orange')
+    leaves = [node for node in leaves if node.is_leaf()]
+    if not leaves:
+        return
+    graph.attr('node', **LEAF_NODE_STYLE)
+    graph.attr('edge', **LEAF_EDGE_STYLE)
+    for node in leaves:
         got_attr, node_attributes = node.get_node_attributes()
         if got_attr:  # Got attributes
-            leaf_attr = str(node_attributes)
-            graph.node(leaf_id, leaf_attr)
+            leaf_id = str(node.id) + 'leaf_'
+            graph.node(leaf_id, leaf_label(node_attributes))
             graph.edge(str(node.id), leaf_id)
 
 
-def produce_ast(ast_nodes, attributes, graph=graphviz.Graph(comment='AST representation')):
+def render_eps(save_path):
+    """ Renders the DOT source stored in save_path into save_path.eps. """
+
+    if _DOT is None:
+        raise graphviz.ExecutableNotFound(['dot'])
+    subprocess.run([_DOT, '-Teps', '-o', save_path + '.eps', save_path], check=True)
+
+
+def produce_ast(ast_nodes, attributes, graph=None, leaves=None):
     """
         Produce an AST in graphviz format.
 
@@ -63,9 +91,11 @@ def produce_ast(ast_nodes, attributes, graph=graphviz.Graph(comment='AST represe
         - ast_nodes: Node
             Output of ast_to_ast_nodes(<ast>, ast_nodes=Node('Program')).
         - graph: Graph
-            Graph object. Be careful it is mutable.
+            Graph object. Be careful it is mutable. Default: new Graph.
         - attributes: bool
             Whether to display the leaf attributes or not.
+        - leaves: list of Node
+            Leaves collected so far, drawn by the outermost call. Default: None.
 
         -------
         Returns:
@@ -73,6 +103,11 @@ def produce_ast(ast_nodes, attributes, graph=graphviz.Graph(comment='AST represe
             graphviz formatted graph.
     """
 
+    if graph is None:
+        graph = graphviz.Graph(comment='AST representation')
+    outermost = leaves is None
+    if outermost:
+        leaves = []
     graph.attr('node', color='black', style='filled', fillcolor='white')
     graph.attr('edge', color='black')
     graph.node(str(ast_nodes.id), ast_nodes.name)
@@ -80,9 +115,11 @@ def produce_ast(ast_nodes, attributes, graph=graphviz.Graph(comment='AST represe
         graph.attr('node', color='black', style='filled', fillcolor='white')
         graph.attr('edge', color='black')
         graph.edge(str(ast_nodes.id), str(child.id))
-        produce_ast(child, attributes, graph)
+        produce_ast(child, attributes, graph, leaves)
         if attributes:
-            append_leaf_attr(child, graph)
+            leaves.append(child)
+    if outermost:
+        append_leaves_attr(leaves, graph)
     return graph
 
 
@@ -105,20 +142,30 @@ def draw_ast(ast_nodes, attributes=False, save_path=None):
         dot.view()
     else:
         dot.render(save_path, view=False)
-        graphviz.render(filepath=save_path, engine='dot', format='eps')
-    dot.clear()
+        render_eps(save_path)
 
 
 def cfg_type_node(child):
     """ Different form according to statement node or not. """
 
-    if isinstance(child, _node.Statement) or child.is_comment():
+    if child.kind in (_node.KIND_STMT, _node.KIND_COMMENT):
         return ['box', 'red', 'lightpink']
     return ['ellipse', 'blue', 'lightblue2']
 
 
-def produce_cfg_one_child(child, data_flow, attributes,
-                          graph=graphviz.Digraph(comment='Control flow representation')):
+def cfg_edges(child, data_flow):
+    """ Outgoing statement, control and (if data_flow) data dependencies of child, tagged with
+    their kind. """
+
+    edges = [((dependency, 'stmt') for dependency in child.statement_dep_children)]
+    if child.kind == _node.KIND_STMT:
+        edges.append((dependency, 'ctrl') for dependency in child.control_dep_children)
+    if data_flow and child.kind == _node.KIND_IDENT:
+        edges.append((dependency, 'data') for dependency in child.data_dep_children)
+    return chain.from_iterable(edges)
+
+
+def produce_cfg_one_child(child, data_flow, attributes, graph=None, leaves=None):
     """
         Produce a CFG in graphviz format.
 
@@ -131,7 +178,9 @@ def produce_cfg_one_child(child, data_flow, attributes,
         - attributes: bool
             Whether to display the leaf attributes or not.
         - graph: Digraph
-            Graph object. Be careful it is mutable.
+            Graph object. Be careful it is mutable. Default: new Digraph.
+        - leaves: list of Node
+            Leaves collected so far, drawn by the outermost call. Default: None.
 
         -------
         Returns:
@@ -139,55 +188,61 @@ def produce_cfg_one_child(child, data_flow, attributes,
             graphviz formatted graph.
     """
 
+    if graph is None:
+        graph = graphviz.Digraph(comment='Control flow representation')
+    outermost = leaves is None
+    if outermost:
+        leaves = []
     type_node = cfg_type_node(child)
     graph.attr('node', shape=type_node[0], style='filled', color=type_node[2],
                fillcolor=type_node[2])
     graph.attr('edge', color=type_node[1])
     graph.node(str(child.id), child.name)
 
-    for child_statement_dep in child.statement_dep_children:
-        child_statement = child_statement_dep.extremity
-        type_node = cfg_type_node(child_statement)
-        graph.attr('node', shape=type_node[0], color=type_node[2], fillcolor=type_node[2])
-        graph.attr('edge', color=type_node[1])
-        graph.edge(str(child.id), str(child_statement.id), label=child_statement_dep.label)
-        produce_cfg_one_child(child_statement, data_flow=data_flow, attributes=attributes,
-                              graph=graph)
-        if attributes:
-            append_leaf_attr(child_statement, graph)
-
-    if isinstance(child, _node.Statement):
-        for child_cf_dep in child.control_dep_children:
-            child_cf = child_cf_dep.extremity
-            type_node = cfg_type_node(child_cf)
+    previous_kind = None
+    for dependency, edge_kind in cfg_edges(child, data_flow):
+        extremity = dependency.extremity
+        if edge_kind == 'data':
+            # No call to the func as already recursive for data/statmt dep on the same nodes
+            if previous_kind != 'data':
+                type_node = cfg_type_node(child)
+                graph.attr('node', shape=type_node[0], color=type_node[2], fillcolor=type_node[2])
+                graph.attr('edge', color=EDGE_COLORS['data'])
+            graph.edge(str(child.id), str(extremity.id), label=dependency.label)
+        else:  # Statement or control dependency, the style depends on the extremity
+            type_node = cfg_type_node(extremity)
             graph.attr('node', shape=type_node[0], color=type_node[2], fillcolor=type_node[2])
             graph.attr('edge', color=type_node[1])
-            graph.edge(str(child.id), str(child_cf.id), label=str(child_cf_dep.label))
-            produce_cfg_one_child(child_cf, data_flow=data_flow, attributes=attributes, graph=graph)
+            graph.edge(str(child.id), str(extremity.id), label=str(dependency.label))
+            produce_cfg_one_child(extremity, data_flow=data_flow, attributes=attributes,
+                                  graph=graph, leaves=leaves)
             if attributes:
-                append_leaf_attr(child_cf, graph)
+                leaves.append(extremity)
+        previous_kind = edge_kind
 
     if data_flow:
-        graph.attr('edge', color='green')
-        if isinstance(child, _node.Identifier):
-            for child_data_dep in child.data_dep_children:
-                child_data = child_data_dep.extremity
-                type_node = cfg_type_node(child)
-                graph.attr('node', shape=type_node[0], color=type_node[2], fillcolor=type_node[2])
-                graph.edge(str(child.id), str(child_data.id), label=child_data_dep.label)
-                # No call to the func as already recursive for data/statmt dep on the same nodes
-                # logging.info("Data dependency on the variable " + child_data.attributes['name'])
-        graph.attr('edge', color='seagreen')
+        graph.attr('edge', color=EDGE_COLORS['param'])
         if hasattr(child, 'fun_param_parents'):  # Function parameters flow
             for child_param in child.fun_param_parents:
                 type_node = cfg_type_node(child)
                 graph.attr('node', shape=type_node[0], color=type_node[2], fillcolor=type_node[2])
                 graph.edge(str(child.id), str(child_param.id), label='param')
 
+    if outermost:
+        append_leaves_attr(leaves, graph)
     return graph
 
 
-def draw_cfg(cfg_nodes, attributes=False, save_path=None):
+def new_digraph(graph, comment):
+    """ Returns graph emptied of any previous drawing, or a new Digraph if graph is None. """
+
+    if graph is None:
+        return graphviz.Digraph(comment=comment)
+    graph.clear()
+    return graph
+
+
+def draw_cfg(cfg_nodes, attributes=False, save_path=None, graph=None):
     """
         Plot a CFG.
 
@@ -199,20 +254,24 @@ def draw_cfg(cfg_nodes, attributes=False, save_path=None):
             Path of the file to store the CFG in.
         - attributes: bool
             Whether to display the leaf attributes or not. Default: False.
+        - graph: Digraph
+            Digraph to draw in, e.g., reused across files. Default: new Digraph.
     """
 
-    dot = graphviz.Digraph()
+    dot = new_digraph(graph, comment='Control flow representation')
+    leaves = []
     for child in cfg_nodes.children:
-        dot = produce_cfg_one_child(child=child, data_flow=False, attributes=attributes)
+        produce_cfg_one_child(child=child, data_flow=False, attributes=attributes, graph=dot,
+                              leaves=leaves)
+    append_leaves_attr(leaves, dot)
     if save_path is None:
         dot.view()
     else:
         dot.render(save_path, view=False)
-        graphviz.render(filepath=save_path, engine='dot', format='eps')
-    dot.clear()
+        render_eps(save_path)
 
 
-def draw_pdg(dfg_nodes, attributes=False, save_path=None):
+def draw_pdg(dfg_nodes, attributes=False, save_path=None, graph=None):
     """
         Plot a PDG.
 
@@ -224,14 +283,18 @@ def draw_pdg(dfg_nodes, attributes=False, save_path=None):
             Path of the file to store the PDG in.
         - attributes: bool
             Whether to display the leaf attributes or not. Default: False.
+        - graph: Digraph
+            Digraph to draw in, e.g., reused across files. Default: new Digraph.
     """
 
-    dot = graphviz.Digraph()
+    dot = new_digraph(graph, comment='PDG representation')
+    leaves = []
     for child in dfg_nodes.children:
-        dot = produce_cfg_one_child(child=child, data_flow=True, attributes=attributes)
+        produce_cfg_one_child(child=child, data_flow=True, attributes=attributes, graph=dot,
+                              leaves=leaves)
+    append_leaves_attr(leaves, dot)
     if save_path is None:
         dot.view()
     else:
         dot.render(save_path, view=False)
-        graphviz.render(filepath=save_path, engine='dot', format='eps')
-    dot.clear()
+        render_eps(save_path)
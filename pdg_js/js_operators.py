@@ -19,9 +19,24 @@
 """
 
 import logging
+import operator as _operator
 
 from . import node as _node
 
+# Used on every evaluated node: hashed membership tests, no _node attribute lookup
+_CALL_EXPR = _node.CALL_EXPR
+_Value = _node.Value
+
+# (MemberExpression, initial_node) -> (Node.epoch, display_member_expression_value suffix)
+MEMBER_DISPLAY_CACHE = {}
+MEMBER_DISPLAY_CACHE_SIZE = 512
+# (node, initial_node, keep_none) -> [Node.epoch, value, hits], for nodes not storing their value
+COMPUTED_VALUE_CACHE = {}
+COMPUTED_VALUE_CACHE_SIZE = 512
+
+# Emptied recvisited sets, reused by the top-level get_node_(computed_)value calls
+RECVISITED_POOL = []
+
 """
 In the following,
     - node: Node
@@ -34,62 +49,45 @@ In the following,
 def get_node_value(node, initial_node=None, recdepth=0, recvisited=None):
     """ Gets the value of node, depending on its type. """
 
-    if recvisited is None:
-        recvisited = set()
+    pooled = recvisited is None
+    if pooled:
+        recvisited = RECVISITED_POOL.pop() if RECVISITED_POOL else set()
+    try:
+        return eval_node_value(node, initial_node=initial_node, recdepth=recdepth,
+                               recvisited=recvisited)
+    finally:
+        if pooled:
+            recvisited.clear()
+            RECVISITED_POOL.append(recvisited)
+
+
+def eval_node_value(node, initial_node, recdepth, recvisited):
+    """ Body of get_node_value, recvisited being set. """
 
     if isinstance(node, _node.ValueExpr):
         if node.value is not None:  # Special case if node references a Node whose value changed
             return node.value
 
-    got_attr, node_attributes = node.get_node_attributes()
-    if got_attr:  # Got attributes, returns the value
-        return node_attributes
+    node_attributes = node.cached_attributes  # Known after the first visit
+    if node_attributes is None:
+        node_attributes = node.get_node_attributes()
+    if node_attributes[0]:  # Got attributes, returns the value
+        return node_attributes[1]
 
     logging.debug('Getting the value from %s', node.name)
 
-    if node.name == 'UnaryExpression':
-        return compute_unary_expression(node, initial_node=initial_node,
-                                        recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name in ('BinaryExpression', 'LogicalExpression'):
-        return compute_binary_expression(node, initial_node=initial_node,
-                                         recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name == 'ArrayExpression':
-        return node
-    if node.name in ('ObjectExpression', 'ObjectPattern'):
-        return node
-    if node.name == 'MemberExpression':
-        return compute_member_expression(node, initial_node=initial_node,
-                                         recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name == 'ThisExpression':
-        return 'this'
     if isinstance(node, _node.FunctionExpression):
         return compute_function_expression(node)
-    if node.name == 'CallExpression' and isinstance(node.children[0], _node.FunctionExpression):
-        return node.children[0].fun_name  # Function called; mapping to the function name if any
-    if node.name in _node.CALL_EXPR:
-        return compute_call_expression(node, initial_node=initial_node,
-                                       recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name == 'ReturnStatement' or node.name == 'BlockStatement':
-        if node.children:
-            return get_node_computed_value(node.children[0], initial_node=initial_node,
-                                           recdepth=recdepth + 1, recvisited=recvisited)
-        return None
-    if node.name == 'TemplateLiteral':
-        return compute_template_literal(node, initial_node=initial_node,
-                                        recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name == 'ConditionalExpression':
-        return compute_conditional_expression(node, initial_node=initial_node,
-                                              recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name == 'AssignmentExpression':
-        return compute_assignment_expression(node, initial_node=initial_node,
-                                             recdepth=recdepth + 1, recvisited=recvisited)
-    if node.name == 'UpdateExpression':
-        return get_node_computed_value(node.children[0], initial_node=initial_node,
-                                       recdepth=recdepth + 1, recvisited=recvisited)
+    handler = NODE_VALUE_HANDLERS.get(node.name)
+    if handler is not None:  # Value computed by a function
+        return handler(node, initial_node=initial_node, recdepth=recdepth + 1,
+                       recvisited=recvisited)
 
-    for child in node.children:
-        get_node_computed_value(child, initial_node=initial_node,
-                                recdepth=recdepth + 1, recvisited=recvisited)
+    for child in node.children:  # Still computed for their provenance and stored values
+        if child in recvisited:  # Would only return its stored value
+            continue
+        eval_node_computed_value(child, initial_node=initial_node, keep_none=False,
+                                 recdepth=recdepth + 1, recvisited=recvisited)
 
     logging.warning('Could not get the value of the node %s, whose attributes are %s',
                     node.name, node.attributes)
@@ -97,30 +95,98 @@ def get_node_value(node, initial_node=None, recdepth=0, recvisited=None):
     return None
 
 
+def compute_first_child(node, initial_node, recdepth=0, recvisited=None):
+    """ Gets the value of a ReturnStatement, BlockStatement or UpdateExpression,
+    i.e., of their first child. """
+
+    if node.children:
+        return eval_node_computed_value(node.children[0], initial_node=initial_node,
+                                        keep_none=False, recdepth=recdepth, recvisited=recvisited)
+    return None
+
+
 def get_node_computed_value(node, initial_node=None, keep_none=False, recdepth=0, recvisited=None):
     """ Computes the value of node, depending on its type. """
 
-    if recvisited is None:
-        recvisited = set()
+    if recvisited is None and recdepth == 0 and not isinstance(node, _node.Value):
+        # Top-level evaluation of a node that does not store its value: cached
+        key = (node, initial_node, keep_none)
+        cached = COMPUTED_VALUE_CACHE.get(key)
+        if cached is not None and cached[0] == _node.Node.epoch:  # Nothing changed since
+            cached[2] += 1
+            return cached[1]
+        value = compute_node_value(node, initial_node=initial_node, keep_none=keep_none,
+                                   recdepth=recdepth, recvisited=recvisited)
+        # Not cached: lists/dicts, which callers may change in place, and values that could have
+        # changed through a call, cf. eval_node_computed_value
+        if not isinstance(value, (list, dict)) and not has_call_expression(node):
+            cache_computed_value(key, value)
+        return value
+    return compute_node_value(node, initial_node=initial_node, keep_none=keep_none,
+                              recdepth=recdepth, recvisited=recvisited)
+
+
+def compute_node_value(node, initial_node=None, keep_none=False, recdepth=0, recvisited=None):
+    """ Computes the value of node, without the cache. """
+
+    pooled = recvisited is None
+    if pooled:
+        recvisited = RECVISITED_POOL.pop() if RECVISITED_POOL else set()
+    try:
+        return eval_node_computed_value(node, initial_node=initial_node, keep_none=keep_none,
+                                        recdepth=recdepth, recvisited=recvisited)
+    finally:
+        if pooled:
+            recvisited.clear()
+            RECVISITED_POOL.append(recvisited)
+
+
+def has_call_expression(node):
+    """ Indicates whether node or one of its descendants is a CallExpression. """
+
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.name in _CALL_EXPR:
+            return True
+        stack.extend(node.children)
+    return False
+
+
+def cache_computed_value(key, value):
+    """ Stores value in COMPUTED_VALUE_CACHE, evicting the least used half when full. """
+
+    if len(COMPUTED_VALUE_CACHE) >= COMPUTED_VALUE_CACHE_SIZE:
+        epoch = _node.Node.epoch
+        kept = sorted(COMPUTED_VALUE_CACHE.items(),
+                      key=lambda item: (item[1][0] == epoch, item[1][2]), reverse=True)
+        COMPUTED_VALUE_CACHE.clear()
+        COMPUTED_VALUE_CACHE.update(kept[:COMPUTED_VALUE_CACHE_SIZE // 2])
+    COMPUTED_VALUE_CACHE[key] = [_node.Node.epoch, value, 0]
+
+
+def eval_node_computed_value(node, initial_node, keep_none, recdepth, recvisited):
+    """ Body of get_node_computed_value, recvisited being set. """
 
     logging.debug("Visiting node: %s", node.attributes)
 
-    if node in recvisited:
+    nb_visited = len(recvisited)
+    recvisited.add(node)
+    if len(recvisited) == nb_visited:  # Already visited, one hash lookup instead of in + add
         if isinstance(node, _node.Value):
             logging.debug("Revisiting node: %s %s (value: %s)", node.attributes, initial_node,
                           node.value)
             return node.value
         logging.debug("Revisiting node: %s %s (none)", node.attributes, initial_node)
         return None
-    recvisited.add(node)
     if recdepth > 1000:
         logging.debug("Recursion depth for get_node_computed_value exceeded: %s", node.attributes)
-        if hasattr(node, "value"):
+        if isinstance(node, _Value):  # Only Values have a value
             return node.value
         return None
 
     value = None
-    if isinstance(initial_node, _node.Value):
+    if initial_node is not None and isinstance(initial_node, _Value):
         logging.debug('%s is depending on %s', initial_node.attributes, node.attributes)
         initial_node.set_provenance(node)
 
@@ -131,18 +197,19 @@ def get_node_computed_value(node, initial_node=None, keep_none=False, recdepth=0
         if isinstance(value, _node.Node):  # node.value is a Node
             # computing actual value
             if node.value != node:
-                value = get_node_computed_value(node.value, initial_node=initial_node,
-                                                recdepth=recdepth + 1, recvisited=recvisited)
+                value = eval_node_computed_value(node.value, initial_node=initial_node,
+                                                 keep_none=False, recdepth=recdepth + 1,
+                                                 recvisited=recvisited)
                 logging.debug('Its value is a node, computed it and got %s', value)
 
     if value is None and not keep_none:  # node is not an Identifier or is None
         # keep_none True is just for display_temp, to avoid having an Identifier variable with
         # None value being equal to the variable because of the call to get_node_value on itself
-        value = get_node_value(node, initial_node=initial_node,
-                               recdepth=recdepth + 1, recvisited=recvisited)
+        value = eval_node_value(node, initial_node=initial_node, recdepth=recdepth + 1,
+                                recvisited=recvisited)
         logging.debug('The value should be computed, got %s', value)
 
-    if isinstance(node, _node.Value) and node.name not in _node.CALL_EXPR:
+    if isinstance(node, _node.Value) and node.name not in _CALL_EXPR:
         # Do not store value for CallExpr as could have changed and should be recomputed
         node.set_value(value)  # Stores the value so as not to compute it again
 
@@ -153,28 +220,36 @@ def compute_operators(operator, node_a, node_b, initial_node=None, recdepth=0, r
     """ Evaluates node_a operator node_b. """
 
     if isinstance(node_a, _node.Node):  # Standard case
-        if isinstance(node_a, _node.Identifier):
-            # If it is an Identifier, it should have a value, possibly None.
-            # But the value should not be the Identifier's name.
-            a = get_node_computed_value(node_a, initial_node=initial_node, keep_none=True,
-                                        recdepth=recdepth + 1, recvisited=recvisited)
-        else:
-            a = get_node_computed_value(node_a, initial_node=initial_node,
-                                        recdepth=recdepth + 1, recvisited=recvisited)
+        # If it is an Identifier, it should have a value, possibly None.
+        # But the value should not be the Identifier's name.
+        a = get_node_computed_value(node_a, initial_node=initial_node,
+                                    keep_none=node_a.kind == _node.KIND_IDENT,
+                                    recdepth=recdepth + 1, recvisited=recvisited)
     else:  # Specific to compute_binary_expression
         a = node_a  # node_a may not be a Node but already a computed result
     if isinstance(node_b, _node.Node):  # Standard case
-        if isinstance(node_b, _node.Identifier):
-            b = get_node_computed_value(node_b, initial_node=initial_node, keep_none=True,
-                                        recdepth=recdepth + 1, recvisited=recvisited)
-        else:
-            b = get_node_computed_value(node_b, initial_node=initial_node,
-                                        recdepth=recdepth + 1, recvisited=recvisited)
+        b = get_node_computed_value(node_b, initial_node=initial_node,
+                                    keep_none=node_b.kind == _node.KIND_IDENT,
+                                    recdepth=recdepth + 1, recvisited=recvisited)
     else:  # Specific to compute_binary_expression
         b = node_b  # node_b may not be a Node but already a computed result
 
+    return apply_operator(operator, a, b)
+
+
+def apply_operator(operator, a, b):
+    """ Evaluates a operator b, a and b being already computed. """
+
+    if (type(a) is int or type(a) is float) and (type(b) is int or type(b) is float):
+        handler = BINARY_OPERATORS.get(operator)  # Numbers, e.g., i + 1: nothing else to check
+        if handler is not None:
+            return handler(a, b)
+
+    # a += b is computed as a + b
+    key = operator[:-1] if operator in COMPOUND_ASSIGNMENTS else operator
+
     if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-        if operator in ('+=', '+') and (isinstance(a, str) or isinstance(b, str)):
+        if key == '+' and (isinstance(a, str) or isinstance(b, str)):
             return operator_plus(a, b)
         if a is None or b is None:
             return None
@@ -189,42 +264,13 @@ def compute_operators(operator, node_a, node_b, initial_node=None, recdepth=0, r
             return None
 
     try:
-        if operator in ('+=', '+'):
-            return operator_plus(a, b)
-        if operator in ('-=', '-'):
-            return operator_minus(a, b)
-        if operator in ('*=', '*'):
-            return operator_asterisk(a, b)
-        if operator in ('/=', '/'):
-            return operator_slash(a, b)
-        if operator in ('**=', '**'):
-            return operator_2asterisk(a, b)
-        if operator in ('%=', '%'):
-            return operator_modulo(a, b)
-        if operator == '++':
-            return operator_plus_plus(a)
-        if operator == '--':
-            return operator_minus_minus(a)
-        if operator in ('==', '==='):
-            return operator_equal(a, b)
-        if operator in ('!=', '!=='):
-            return operator_different(a, b)
-        if operator == '!':
-            return operator_not(a)
-        if operator == '>=':
-            return operator_bigger_equal(a, b)
-        if operator == '>':
-            return operator_bigger(a, b)
-        if operator == '<=':
-            return operator_smaller_equal(a, b)
-        if operator == '<':
-            return operator_smaller(a, b)
-        if operator == '&&':
-            return operator_and(a, b)
-        if operator == '||':
-            return operator_or(a, b)
-        if operator in ('&', '>>', '>>>', '<<', '^', '|', '&=', '>>=', '>>>=', '<<=', '^=', '|=',
-                        'in', 'instanceof'):
+        handler = BINARY_OPERATORS.get(key)
+        if handler is not None:
+            return handler(a, b)
+        handler = UNARY_OPERATORS.get(key)
+        if handler is not None:
+            return handler(a)
+        if key in UNSUPPORTED_OPERATORS:
             logging.warning('Currently not handling the operator %s', operator)
             return None
 
@@ -276,7 +322,7 @@ def compute_member_expression(node, initial_node, compute=True, recdepth=0, recv
                                          recvisited=recvisited)  # Computes the value
     obj_value = get_node_computed_value(obj, initial_node=initial_node,
                                         recdepth=recdepth + 1, recvisited=recvisited)
-    if obj.name == 'ThisExpression' or obj_value in _node.GLOBAL_VAR:
+    if obj.name == 'ThisExpression' or _node.is_global_var(obj_value):
         return prop_value
 
     if not isinstance(obj_value, _node.Node):
@@ -304,19 +350,17 @@ def compute_member_expression(node, initial_node, compute=True, recdepth=0, recv
         member_expression_value = obj_value  # We already have the value
     else:
         if isinstance(prop_value, str):  # obj_value.prop_value -> prop_value str = object property
-            obj_prop_list = []
-            search_object_property(obj_value, prop_value, obj_prop_list)
-            if obj_prop_list:  # Stores all matches
-                member_expression_value = None
-                for obj_prop in obj_prop_list:
-                    member_expression_value, worked = get_property_value(obj_prop,
-                                                                         initial_node=initial_node,
-                                                                         recdepth=recdepth + 1,
-                                                                         recvisited=recvisited)
-                    if worked:  # Takes the first one that is working
-                        break
-            else:
-                member_expression_value = None
+            member_expression_value = None
+            found = False
+            for obj_prop in search_object_property(obj_value, prop_value):  # Matches, lazily
+                found = True
+                member_expression_value, worked = get_property_value(obj_prop,
+                                                                     initial_node=initial_node,
+                                                                     recdepth=recdepth + 1,
+                                                                     recvisited=recvisited)
+                if worked:  # Takes the first one that is working
+                    break
+            if not found:
                 logging.warning('Could not get the property %s of the %s with value %s',
                                 prop_value, obj.name, obj_value)
         elif isinstance(prop_value, int):  # obj_value[prop_value] -> prop_value int = array index
@@ -337,9 +381,9 @@ def compute_member_expression(node, initial_node, compute=True, recdepth=0, recv
     return member_expression_value  # Returns the node referencing the value
 
 
-def search_object_property(node, prop, found_list):
+def search_object_property(node, prop):
     """ Search in an object definition where a given property (-> prop = str) is defined.
-    Storing all the matches in case the first one is not the right one, e.g.,
+    Yielding all the matches, in order, in case the first one is not the right one, e.g.,
     var obj = {
         f1: function(a) {obj.f2(1)},
         f2: function(a) {}
@@ -347,19 +391,22 @@ def search_object_property(node, prop, found_list):
     obj.f2();
     By looking for f2, the 1st match is wrong and will lead to an error, the 2nd one is correct."""
 
-    if 'name' in node.attributes:
-        if isinstance(prop, str):
-            if node.attributes['name'] == prop:
+    if not isinstance(prop, str):
+        return
+
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        node_attributes = node.attributes
+        if 'name' in node_attributes:
+            if node_attributes['name'] == prop:
                 # prop is already the value
-                found_list.append(node)
-    elif 'value' in node.attributes:
-        if isinstance(prop, str):
-            if node.attributes['value'] == prop:
+                yield node
+        elif 'value' in node_attributes:
+            if node_attributes['value'] == prop:
                 # prop is already the value
-                found_list.append(node)
-
-    for child in node.children:
-        search_object_property(child, prop, found_list)
+                yield node
+        stack.extend(reversed(node.children))
 
 
 def get_property_value(node, initial_node, recdepth=0, recvisited=None):
@@ -387,23 +434,39 @@ def compute_function_expression(node):
     return node  # Otherwise mapping to the FunExpr handler
 
 
+def node_itself(node, initial_node=None, recdepth=0, recvisited=None):
+    """ Value of an ArrayExpression or ObjectExpression/Pattern: the node itself. """
+
+    return node
+
+
+def this_expression_value(node, initial_node=None, recdepth=0, recvisited=None):
+    """ Value of a ThisExpression. """
+
+    return 'this'
+
+
+def call_expression_value(node, initial_node, recdepth=0, recvisited=None):
+    """ Value of a CallExpression, TaggedTemplateExpression or NewExpression. """
+
+    if node.name == 'CallExpression' and isinstance(node.children[0], _node.FunctionExpression):
+        return node.children[0].fun_name  # Function called; mapping to the function name if any
+    return compute_call_expression(node, initial_node=initial_node, recdepth=recdepth,
+                                   recvisited=recvisited)
+
+
 def compute_call_expression(node, initial_node, recdepth=0, recvisited=None):
     """ Gets the value of CallExpression with parameters. """
 
-    if isinstance(initial_node, _node.Value):
+    if initial_node is not None and isinstance(initial_node, _Value):
         initial_node.set_provenance(node)
 
     callee = node.children[0]
-    params = '('
-
-    for arg in range(1, len(node.children)):
-        # Computes the value of the arguments: a.b...(arg1, arg2...)
-        params += str(get_node_computed_value(node.children[arg], initial_node=initial_node,
-                                              recdepth=recdepth + 1, recvisited=recvisited))
-        if arg < len(node.children) - 1:
-            params += ', '
-
-    params += ')'
+    # Computes the value of the arguments: a.b...(arg1, arg2...)
+    params = '(' + ', '.join([str(get_node_computed_value(arg, initial_node=initial_node,
+                                                          recdepth=recdepth + 1,
+                                                          recvisited=recvisited))
+                              for arg in node.children[1:]]) + ')'
 
     if isinstance(callee, _node.Identifier):
         return str(get_node_computed_value(callee, initial_node=initial_node,
@@ -415,20 +478,20 @@ def compute_call_expression(node, initial_node, recdepth=0, recvisited=None):
         return value
         # return compute_member_expression(callee) + params  # To test if problems here
 
-    if callee.name in _node.CALL_EXPR:
-        if get_node_computed_value(callee, initial_node=initial_node, recdepth=recdepth + 1,
-                                   recvisited=recvisited) is None or params is None:
+    if callee.name in _CALL_EXPR:
+        callee_value = get_node_computed_value(callee, initial_node=initial_node,
+                                               recdepth=recdepth + 1, recvisited=recvisited)
+        if callee_value is None or params is None:
             return None
-        return get_node_computed_value(callee, initial_node=initial_node,
-                                       recdepth=recdepth + 1, recvisited=recvisited) + params
+        return callee_value + params
 
     if callee.name == 'LogicalExpression':  # a || b, if a not False a otherwise b
-        if get_node_computed_value(callee.children[0], initial_node=initial_node,
-                                   recdepth=recdepth + 1, recvisited=recvisited) is False:
+        left_value = get_node_computed_value(callee.children[0], initial_node=initial_node,
+                                             recdepth=recdepth + 1, recvisited=recvisited)
+        if left_value is False:
             return get_node_computed_value(callee.children[1], initial_node=initial_node,
                                            recdepth=recdepth + 1, recvisited=recvisited)
-        return get_node_computed_value(callee.children[0], initial_node=initial_node,
-                                       recdepth=recdepth + 1, recvisited=recvisited)
+        return left_value
 
     logging.error('Got a CallExpression on %s with attributes %s and id %s',
                   callee.name, callee.attributes, callee.id)
@@ -440,7 +503,6 @@ def compute_template_literal(node, initial_node, recdepth=0, recvisited=None):
 
     template_element = []  # Seems that TemplateElement = similar to Literal and in front
     expressions = []  # vs. Expressions has to be computed and are at the end
-    template_literal = ''
 
     for child in node.children:
         if child.name == 'TemplateElement':  # Either that
@@ -456,39 +518,53 @@ def compute_template_literal(node, initial_node, recdepth=0, recvisited=None):
                       len_template_element, len_expressions)
         return None
 
+    # Will concatenate: 1 TemplateElement, 1 Expr, ..., 1 TemplateElement
+    parts = []
     for i in range(len_expressions):
-        # Will concatenate: 1 TemplateElement, 1 Expr, ..., 1 TemplateElement
-        template_literal += str(get_node_computed_value(template_element[i],
-                                                        initial_node=initial_node,
-                                                        recdepth=recdepth + 1,
-                                                        recvisited=recvisited)) \
-                            + str(get_node_computed_value(expressions[i],
-                                                          initial_node=initial_node,
-                                                          recdepth=recdepth + 1,
-                                                          recvisited=recvisited))
-    template_literal += str(get_node_computed_value(template_element[len_template_element - 1],
-                                                    initial_node=initial_node,
-                                                    recdepth=recdepth + 1,
-                                                    recvisited=recvisited))
+        parts.append(str(get_node_computed_value(template_element[i], initial_node=initial_node,
+                                                 recdepth=recdepth + 1, recvisited=recvisited)))
+        parts.append(str(get_node_computed_value(expressions[i], initial_node=initial_node,
+                                                 recdepth=recdepth + 1, recvisited=recvisited)))
+    parts.append(str(get_node_computed_value(template_element[len_template_element - 1],
+                                             initial_node=initial_node,
+                                             recdepth=recdepth + 1, recvisited=recvisited)))
+
+    return ''.join(parts)
+
 
-    return template_literal
+def clear_caches():
+    """ Empties the computed value caches, e.g., before building a new PDG. """
+
+    MEMBER_DISPLAY_CACHE.clear()
+    COMPUTED_VALUE_CACHE.clear()
 
 
 def display_member_expression_value(node, value, initial_node):
     """ Displays the value of elements from a MemberExpression. """
 
+    key = (node, initial_node)
+    cached = MEMBER_DISPLAY_CACHE.get(key)
+    if cached is not None and cached[0] == _node.Node.epoch:  # Nothing changed since
+        return value + cached[1]
+
+    member_value = ''
     for child in node.children:
         if child.name == 'MemberExpression':
-            value = display_member_expression_value(child, value, initial_node=initial_node)
+            member_value = display_member_expression_value(child, member_value,
+                                                           initial_node=initial_node)
         else:
-            value += str(get_node_computed_value(child, initial_node=initial_node)) + '.'
-    return value
+            member_value += str(get_node_computed_value(child, initial_node=initial_node)) + '.'
+
+    if len(MEMBER_DISPLAY_CACHE) >= MEMBER_DISPLAY_CACHE_SIZE:
+        MEMBER_DISPLAY_CACHE.clear()
+    MEMBER_DISPLAY_CACHE[key] = (_node.Node.epoch, member_value)
+    return value + member_value
 
 
 def compute_object_expr(node, initial_node):
     """ For debug: displays the content of an ObjectExpression. """
 
-    node_value = '{'
+    node_value = []
 
     for prop in node.children:
         key = prop.children[0]
@@ -497,10 +573,9 @@ def compute_object_expr(node, initial_node):
         value_value = get_node_computed_value(value, initial_node=initial_node)
 
         prop_value = str(key_value) + ': ' + str(value_value)
-        node_value += '\n\t' + prop_value
+        node_value.append('\n\t' + prop_value)
 
-    node_value += '\n}'
-    return node_value
+    return '{' + ''.join(node_value) + '\n}'
 
 
 def compute_conditional_expression(node, initial_node, recdepth=0, recvisited=None):
@@ -538,14 +613,8 @@ def operator_plus(a, b):
     return a + b
 
 
-def operator_minus(a, b):
-    """ Evaluates a - b. """
-    return a - b
-
-
-def operator_asterisk(a, b):
-    """ Evaluates a * b. """
-    return a * b
+operator_minus = _operator.sub  # Evaluates a - b, in C
+operator_asterisk = _operator.mul  # Evaluates a * b, in C
 
 
 def operator_slash(a, b):
@@ -556,14 +625,8 @@ def operator_slash(a, b):
     return a / b
 
 
-def operator_2asterisk(a, b):
-    """ Evaluates a ** b. """
-    return a ** b
-
-
-def operator_modulo(a, b):
-    """ Evaluates a % b. """
-    return a % b
+operator_2asterisk = _operator.pow  # Evaluates a ** b, in C
+operator_modulo = _operator.mod  # Evaluates a % b, in C
 
 
 def operator_plus_plus(a):
@@ -578,11 +641,15 @@ def operator_minus_minus(a):
 
 def operator_equal(a, b):
     """ Evaluates a == b. """
+    if a is b and not isinstance(a, float):  # Same object, e.g., interned str; but NaN != NaN
+        return True
     return a == b
 
 
 def operator_different(a, b):
     """ Evaluates a != b. """
+    if a is b and not isinstance(a, float):
+        return False
     return a != b
 
 
@@ -591,24 +658,10 @@ def operator_not(a):
     return not a
 
 
-def operator_bigger_equal(a, b):
-    """ Evaluates a >= b. """
-    return a >= b
-
-
-def operator_bigger(a, b):
-    """ Evaluates a > b. """
-    return a > b
-
-
-def operator_smaller_equal(a, b):
-    """ Evaluates a <= b. """
-    return a <= b
-
-
-def operator_smaller(a, b):
-    """ Evaluates a < b. """
-    return a < b
+operator_bigger_equal = _operator.ge  # Evaluates a >= b, in C
+operator_bigger = _operator.gt  # Evaluates a > b, in C
+operator_smaller_equal = _operator.le  # Evaluates a <= b, in C
+operator_smaller = _operator.lt  # Evaluates a < b, in C
 
 
 def operator_and(a, b):
@@ -619,3 +672,50 @@ def operator_and(a, b):
 def operator_or(a, b):
     """ Evaluates a or b. """
     return a or b
+
+
+# Operator -> function evaluating it, instead of testing the operators one after the other
+BINARY_OPERATORS = {
+    '+': operator_plus,
+    '-': operator_minus,
+    '*': operator_asterisk,
+    '/': operator_slash,
+    '**': operator_2asterisk,
+    '%': operator_modulo,
+    '==': operator_equal, '===': operator_equal,
+    '!=': operator_different, '!==': operator_different,
+    '>=': operator_bigger_equal,
+    '>': operator_bigger,
+    '<=': operator_smaller_equal,
+    '<': operator_smaller,
+    '&&': operator_and,
+    '||': operator_or,
+}
+UNARY_OPERATORS = {
+    '++': operator_plus_plus,
+    '--': operator_minus_minus,
+    '!': operator_not,
+}
+UNSUPPORTED_OPERATORS = frozenset(('&', '>>', '>>>', '<<', '^', '|', 'in', 'instanceof'))
+# Compound assignments, looked up without their trailing =
+COMPOUND_ASSIGNMENTS = frozenset(('+=', '-=', '*=', '/=', '**=', '%=', '&=', '|=', '^=', '>>=',
+                                  '>>>=', '<<='))
+
+# Node name -> function computing its value, called with recdepth + 1 as the other compute_*
+NODE_VALUE_HANDLERS = {
+    'ArrayExpression': node_itself,
+    'ObjectExpression': node_itself,
+    'ObjectPattern': node_itself,
+    'MemberExpression': compute_member_expression,
+    'ThisExpression': this_expression_value,
+    'UnaryExpression': compute_unary_expression,
+    'BinaryExpression': compute_binary_expression,
+    'LogicalExpression': compute_binary_expression,
+    'ReturnStatement': compute_first_child,
+    'BlockStatement': compute_first_child,
+    'UpdateExpression': compute_first_child,
+    'TemplateLiteral': compute_template_literal,
+    'ConditionalExpression': compute_conditional_expression,
+    'AssignmentExpression': compute_assignment_expression,
+}
+NODE_VALUE_HANDLERS.update(dict.fromkeys(_CALL_EXPR, call_expression_value))
@@ -55,4 +55,4 @@ RESERVED_WORDS = ["abstract", "arguments", "await", "boolean", "break", "byte",
 BROWSER_EXTENSIONS = ['addEventListener', 'browser', 'chrome', 'localStorage', 'postMessage',
                       'Promise', 'JSON', 'XMLHttpRequest', '$', 'screen', 'CryptoJS']
 
-KNOWN_WORDS_LOWER = [word.lower() for word in RESERVED_WORDS + BROWSER_EXTENSIONS]
+KNOWN_WORDS_LOWER = frozenset(word.lower() for word in RESERVED_WORDS + BROWSER_EXTENSIONS)
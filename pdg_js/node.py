@@ -33,72 +33,112 @@
 # parameter flows, value handling, provenance tracking, etc
 
 
+import collections
+import itertools
 import logging
 import random
 
 from . import utility_df
 
-EXPRESSIONS = ['AssignmentExpression', 'ArrayExpression', 'ArrowFunctionExpression',
-               'AwaitExpression', 'BinaryExpression', 'CallExpression', 'ClassExpression',
-               'ConditionalExpression', 'FunctionExpression', 'LogicalExpression',
-               'MemberExpression', 'NewExpression', 'ObjectExpression', 'SequenceExpression',
-               'TaggedTemplateExpression', 'ThisExpression', 'UnaryExpression', 'UpdateExpression',
-               'YieldExpression']
+EXPRESSIONS = frozenset(('AssignmentExpression', 'ArrayExpression', 'ArrowFunctionExpression',
+                         'AwaitExpression', 'BinaryExpression', 'CallExpression', 'ClassExpression',
+                         'ConditionalExpression', 'FunctionExpression', 'LogicalExpression',
+                         'MemberExpression', 'NewExpression', 'ObjectExpression',
+                         'SequenceExpression', 'TaggedTemplateExpression', 'ThisExpression',
+                         'UnaryExpression', 'UpdateExpression', 'YieldExpression'))
 
-EPSILON = ['BlockStatement', 'DebuggerStatement', 'EmptyStatement',
-           'ExpressionStatement', 'LabeledStatement', 'ReturnStatement',
-           'ThrowStatement', 'WithStatement', 'CatchClause', 'VariableDeclaration',
-           'FunctionDeclaration', 'ClassDeclaration']
+EPSILON = frozenset(('BlockStatement', 'DebuggerStatement', 'EmptyStatement',
+                     'ExpressionStatement', 'LabeledStatement', 'ReturnStatement',
+                     'ThrowStatement', 'WithStatement', 'CatchClause', 'VariableDeclaration',
+                     'FunctionDeclaration', 'ClassDeclaration'))
 
-CONDITIONAL = ['DoWhileStatement', 'ForStatement', 'ForOfStatement', 'ForInStatement',
-               'IfStatement', 'SwitchCase', 'SwitchStatement', 'TryStatement',
-               'WhileStatement', 'ConditionalExpression']
+CONDITIONAL = frozenset(('DoWhileStatement', 'ForStatement', 'ForOfStatement', 'ForInStatement',
+                         'IfStatement', 'SwitchCase', 'SwitchStatement', 'TryStatement',
+                         'WhileStatement', 'ConditionalExpression'))
 
-UNSTRUCTURED = ['BreakStatement', 'ContinueStatement']
+UNSTRUCTURED = frozenset(('BreakStatement', 'ContinueStatement'))
 
-STATEMENTS = EPSILON + CONDITIONAL + UNSTRUCTURED
-CALL_EXPR = ['CallExpression', 'TaggedTemplateExpression', 'NewExpression']
-VALUE_EXPR = ['Literal', 'ArrayExpression', 'ObjectExpression', 'ObjectPattern'] + CALL_EXPR
-COMMENTS = ['Line', 'Block']
+STATEMENTS = EPSILON | CONDITIONAL | UNSTRUCTURED
+CALL_EXPR = frozenset(('CallExpression', 'TaggedTemplateExpression', 'NewExpression'))
+VALUE_EXPR = frozenset(('Literal', 'ArrayExpression', 'ObjectExpression', 'ObjectPattern')) \
+    | CALL_EXPR
+COMMENTS = frozenset(('Line', 'Block'))
 
-GLOBAL_VAR = ['window', 'this', 'self', 'top', 'global', 'that']
+GLOBAL_VAR = frozenset(('window', 'this', 'self', 'top', 'global', 'that'))
 
 LIMIT_SIZE = utility_df.LIMIT_SIZE  # To avoid list values with over 1,000 characters
 
+# Node type tags, set at construction so that hot traversals compare an int instead of isinstance
+KIND_EXPR, KIND_STMT, KIND_IDENT, KIND_COMMENT = range(4)
 
-class Dependence:
-    """ For control, data, comment, and statement dependencies. """
+class _Missing:
+    """ Sentinel type; pickled by reference so that a stored PDG still uses MISSING. """
 
-    def __init__(self, dependency_type, extremity, label, nearest_statement=None):
-        self.type = dependency_type
-        self.extremity = extremity
-        self.nearest_statement = nearest_statement
-        self.label = label
+    __slots__ = ()
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()  # Default for dict.get, as None can be an attribute value
+
+# Type of a Literal value, cf. literal_type
+LITERAL_TYPES = {str: 'String', bool: 'Bool', int: 'Int', float: 'Numeric', type(None): 'Null'}
+
+# Node ids; random start to limit id collision between 2 ASTs from separate processes
+NODE_IDS = itertools.count(random.randint(0, 2**32) << 20)
+
+
+# For control, data, comment, and statement dependencies; never modified once created
+Dependence = collections.namedtuple('Dependence', ('type', 'extremity', 'label',
+                                                   'nearest_statement'), defaults=(None,))
 
 
 class Node:
     """ Defines a Node that is used in the AST. """
 
-    id = random.randint(0, 2*32)  # To limit id collision between 2 ASTs from separate processes
+    # Slotted, as an AST has many nodes; fun_param_X are only set on function parameters/arguments
+    __slots__ = ('name', 'id', 'filename', 'attributes', 'cached_attributes', 'cached_line',
+                 'body', 'body_list', 'parent', 'root', 'children', 'statement_dep_parents',
+                 'statement_dep_children', 'kind', 'fun_param_children', 'fun_param_parents')
+
+    # Validity stamp of the values computed and cached by js_operators. Invariant: every change
+    # to a node or value that a computed value may depend on (attributes, children, parent,
+    # value, fun_name, provenance, in-place value updates) calls Node.touch(), so that a cache
+    # entry stored at the current epoch is still what a fresh evaluation would return; this
+    # includes its provenance side effects, which are then already recorded.
+    epoch = 0
+
+    @staticmethod
+    def touch():
+        """ Invalidates the values computed so far, cf. epoch. """
+        Node.epoch += 1
 
     def __init__(self, name, parent=None):
         self.name = name
-        self.id = Node.id
-        Node.id += 1
+        self.id = next(NODE_IDS)
         self.filename = ''
         self.attributes = {}
+        self.cached_attributes = None  # get_node_attributes result, reset when attributes change
+        self.cached_line = MISSING  # get_line result, idem
         self.body = None
         self.body_list = False
         self.parent = parent
+        self.root = self if parent is None else parent.root  # For get_file
         self.children = []
-        self.statement_dep_parents = []
-        self.statement_dep_children = []  # Between Statement and their non-Statement descendants
+        # Empty tuples, replaced by lists on first use: most nodes never get such dependencies
+        self.statement_dep_parents = ()
+        self.statement_dep_children = ()  # Between Statement and their non-Statement descendants
+        self.kind = KIND_COMMENT if name in COMMENTS else KIND_EXPR
 
     def is_leaf(self):
         return not self.children
 
     def set_attribute(self, attribute_type, node_attribute):
         self.attributes[attribute_type] = node_attribute
+        self.cached_attributes = None
+        self.cached_line = MISSING
+        Node.touch()
 
     def set_body(self, body):
         self.body = body
@@ -108,17 +148,41 @@ class Node:
 
     def set_parent(self, parent):
         self.parent = parent
+        self.root = self if parent is None else parent.root  # Descendants: same AST, same root
+        Node.touch()
 
     def set_child(self, child):
         self.children.append(child)
+        Node.touch()
 
     def adopt_child(self, step_daddy):  # child = self changes parent
         old_parent = self.parent
-        old_parent.children.remove(self)  # Old parent does not point to the child anymore
-        step_daddy.children.insert(0, self)  # New parent points to the child
+        siblings = old_parent.children
+        index = siblings.index(self)
+        if old_parent is step_daddy:  # Hoisting in the same block: only the elder siblings shift
+            siblings[1:index + 1] = siblings[:index]
+            siblings[0] = self
+        else:
+            del siblings[index]  # Old parent does not point to the child anymore
+            step_daddy.children.insert(0, self)  # New parent points to the child
         self.set_parent(step_daddy)  # The child points to its new parent
 
+    def freeze(self):
+        """ Turns the children and statement dependencies of self and its descendants into
+        tuples, once the AST and CFG are built and these do not change anymore. """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node.children = tuple(node.children)
+            node.statement_dep_parents = tuple(node.statement_dep_parents)
+            node.statement_dep_children = tuple(node.statement_dep_children)
+            stack.extend(node.children)
+
     def set_statement_dependency(self, extremity):
+        if not self.statement_dep_children:
+            self.statement_dep_children = []
+        if not extremity.statement_dep_parents:
+            extremity.statement_dep_parents = []
         self.statement_dep_children.append(Dependence('statement dependency', extremity, ''))
         extremity.statement_dep_parents.append(Dependence('statement dependency', self, ''))
 
@@ -127,230 +191,249 @@ class Node:
         # extremity.statement_dep_parents.append(Dependence('comment dependency', self, 'c'))
 
     def is_comment(self):
-        if self.name in COMMENTS:
-            return True
-        return False
+        return self.kind == KIND_COMMENT
 
     def get_node_attributes(self):
         """ Get the attributes regex, value or name of a node. """
+        if self.cached_attributes is None:
+            self.cached_attributes = self.compute_node_attributes()
+        return self.cached_attributes
+
+    def compute_node_attributes(self):
+        """ Get the attributes regex, value or name of a node, without the cache. """
         node_attribute = self.attributes
-        if 'regex' in node_attribute:
-            regex = node_attribute['regex']
-            if isinstance(regex, dict) and 'pattern' in regex:
-                return True, '/' + str(regex['pattern']) + '/'
-        if 'value' in node_attribute:
-            value = node_attribute['value']
-            if isinstance(value, dict) and 'raw' in value:
+        regex = node_attribute.get('regex')
+        if type(regex) is dict and 'pattern' in regex:  # Attributes come from JSON: exact types
+            return True, '/' + str(regex['pattern']) + '/'
+        value = node_attribute.get('value', MISSING)
+        if value is not MISSING:
+            if type(value) is dict and 'raw' in value:
                 return True, value['raw']
-            return True, node_attribute['value']
-        if 'name' in node_attribute:
-            return True, node_attribute['name']
+            return True, value
+        name = node_attribute.get('name', MISSING)
+        if name is not MISSING:
+            return True, name
         return False, None  # Just None was a pb when used in get_node_value as value could be None
 
     def get_line(self):
         """ Gets the line number where a given node is defined. """
-        try:
-            line_begin = self.attributes['loc']['start']['line']
-            line_end = self.attributes['loc']['end']['line']
-            return str(line_begin) + ' - ' + str(line_end)
-        except KeyError:
-            return None
+        if self.cached_line is MISSING:
+            loc = self.attributes.get('loc')
+            try:
+                self.cached_line = str(loc['start']['line']) + ' - ' + str(loc['end']['line'])
+            except (KeyError, TypeError):  # TypeError: no loc
+                self.cached_line = None
+        return self.cached_line
 
     def get_file(self):
-        parent = self
-        while True:
-            if parent is not None and parent.parent:
-                parent = parent.parent
-            else:
-                break
-        if parent is not None:
-            if "filename" in parent.attributes:
-                return parent.attributes["filename"]
-        return ''
+        return self.root.attributes.get('filename', '')
 
 
 def literal_type(literal_node):
     """ Gets the type of a Literal node. """
 
-    if 'value' in literal_node.attributes:
-        literal = literal_node.attributes['value']
-        if isinstance(literal, str):
-            return 'String'
-        if isinstance(literal, int):
-            return 'Int'
-        if isinstance(literal, float):
-            return 'Numeric'
-        if isinstance(literal, bool):
-            return 'Bool'
-        if literal == 'null' or literal is None:
-            return 'Null'
-    if 'regex' in literal_node.attributes:
+    attributes = literal_node.attributes
+    if 'value' in attributes:
+        # Exact type, as bool is a subclass of int
+        literal_type_name = LITERAL_TYPES.get(type(attributes['value']))
+        if literal_type_name is not None:
+            return literal_type_name
+    if 'regex' in attributes:
         return 'RegExp'
-    logging.error('The literal %s has an unknown type', literal_node.attributes['raw'])
+    logging.error('The literal %s has an unknown type', attributes['raw'])
     return None
 
 
-def shorten_value_list(value_list, value_list_shortened, counter=0):
-    """ When a value is a list, shorten it so that keep at most LIMIT_SIZE characters. """
-
-    for el in value_list:
-        if isinstance(el, list):
-            value_list_shortened.append([])
-            counter = shorten_value_list(el, value_list_shortened[-1], counter)
-            if counter >= LIMIT_SIZE:
-                return counter
-        elif isinstance(el, str):
-            counter += len(el)
-            if counter < LIMIT_SIZE:
-                value_list_shortened.append(el)
-        else:
-            counter += len(str(el))
-            if counter < LIMIT_SIZE:
-                value_list_shortened.append(el)
+def is_global_var(value):
+    """ Indicates whether a computed value is a global object, e.g., window. Computed values may
+    be unhashable (list, dict), hence the str test before looking GLOBAL_VAR up. """
+
+    return isinstance(value, str) and value in GLOBAL_VAR
+
+
+def shorten_value(value, value_shortened=None):
+    """
+        When a value is a list or a dict, shorten it so that keep at most LIMIT_SIZE characters.
+        Nested lists (and dicts in dicts) are handled with an explicit stack.
+
+        -------
+        Parameters:
+        - value: list or dict
+            Value to shorten.
+        - value_shortened: list or dict
+            Empty container of the same type, filled with the shortened value. Default: None,
+            to only count, stopping as soon as LIMIT_SIZE is reached.
+
+        -------
+        Returns:
+        - int
+            Number of characters counted, the value should be shortened if >= LIMIT_SIZE.
+    """
+
+    counter = 0
+    visited = set()  # Dicts ids, for cycles
+    if isinstance(value, dict):
+        visited.add(id(value))
+        stack = [(True, iter(value.items()), value_shortened)]
+    else:
+        stack = [(False, iter(value), value_shortened)]
+
+    while stack:
+        is_dict, elements, shortened = stack[-1]
+        child = None
+        for element in elements:
+            if is_dict:
+                k, v = element
+                if isinstance(k, str):
+                    counter += len(k)
+            else:
+                v = element
+            if isinstance(v, list):
+                child = (False, iter(v), None if shortened is None else [])
+            elif is_dict and isinstance(v, dict):
+                if id(v) in visited:  # Stops shortening the current dict
+                    if shortened is not None:
+                        shortened[k] = {}
+                    break
+                visited.add(id(v))
+                child = (True, iter(v.items()), None if shortened is None else {})
+            else:
+                if counter >= LIMIT_SIZE and value_shortened is not None:
+                    continue  # Past the limit, scalars are dropped: no need to measure them
+                counter += len(v) if isinstance(v, str) else len(str(v))
+                if counter < LIMIT_SIZE:
+                    if is_dict and shortened is not None:
+                        shortened[k] = v
+                    elif shortened is not None:
+                        shortened.append(v)
+                elif value_shortened is None:
+                    return counter  # Only counting, we know that value should be shortened
+                continue
+            if is_dict and shortened is not None:
+                shortened[k] = child[2]
+            elif shortened is not None:
+                shortened.append(child[2])
+            break
+
+        if child is not None:  # Shortens the nested list/dict first
+            stack.append(child)
+            continue
+        stack.pop()  # Current list/dict done
+        if stack and counter >= LIMIT_SIZE:
+            break
     return counter
 
 
-def shorten_value_dict(value_dict, value_dict_shortened, counter=0, visited=None):
-    """ When a value is a dict, shorten it so that keep at most LIMIT_SIZE characters. """
-
-    if visited is None:
-        visited = set()
-    if id(value_dict) in visited:
-        return counter
-    visited.add(id(value_dict))
-
-    for k, v in value_dict.items():
-        if isinstance(k, str):
-            counter += len(k)
-        if isinstance(v, list):
-            value_dict_shortened[k] = []
-            counter = shorten_value_list(v, value_dict_shortened[k], counter)
-            if counter >= LIMIT_SIZE:
-                return counter
-        elif isinstance(v, dict):
-            value_dict_shortened[k] = {}
-            if id(v) in visited:
-                return counter
-            counter = shorten_value_dict(v, value_dict_shortened[k], counter, visited)
-            if counter >= LIMIT_SIZE:
-                return counter
-        elif isinstance(v, str):
-            counter += len(v)
-            if counter < LIMIT_SIZE:
-                value_dict_shortened[k] = v
-        else:
-            counter += len(str(v))
-            if counter < LIMIT_SIZE:
-                value_dict_shortened[k] = v
-    return counter
+def add_new(elements, elements_set, candidates):
+    """ Appends to elements, in order, the candidates that are not in elements_set yet. """
+
+    new_elements = [el for el in dict.fromkeys(candidates) if el not in elements_set]
+    if new_elements:
+        elements.extend(new_elements)
+        elements_set.update(new_elements)
+        Node.touch()
+
+
+# Value and Function are mixed into Node subclasses, which declare their slots (layout conflict)
+VALUE_SLOTS = ('value', 'update_value', 'provenance_children', 'provenance_parents',
+               'provenance_children_set', 'provenance_parents_set')
+FUNCTION_SLOTS = ('fun_name', 'fun_params', 'fun_return', 'retraverse', 'called')
 
 
 class Value:
     """ To store the value of a specific node. """
 
+    __slots__ = ()
+
     def __init__(self):
         self.value = None
         self.update_value = True
-        self.provenance_children = []
-        self.provenance_parents = []
-        self.provenance_children_set = set()
-        self.provenance_parents_set = set()
-        self.seen_provenance = set()
+        # Empty tuples/frozensets, replaced by lists/sets on first use, cf. add_provenance_X
+        self.provenance_children = ()
+        self.provenance_parents = ()
+        self.provenance_children_set = frozenset()
+        self.provenance_parents_set = frozenset()
 
     def set_value(self, value):
-        if isinstance(value, list):  # To shorten value if over LIMIT_SIZE characters
-            value_shortened = []
-            counter = shorten_value_list(value, value_shortened)
-            if counter >= LIMIT_SIZE:
-                value = value_shortened
-                logging.warning('Shortened the value of %s %s', self.name, self.attributes)
-        elif isinstance(value, dict):  # To shorten value if over LIMIT_SIZE characters
-            value_shortened = {}
-            counter = shorten_value_dict(value, value_shortened)
-            if counter >= LIMIT_SIZE:
+        if isinstance(value, (list, dict)):  # To shorten value if over LIMIT_SIZE characters
+            # Counts first, the shortened copy is only built for the (rare) values to shorten
+            if value and shorten_value(value) >= LIMIT_SIZE:
+                value_shortened = [] if isinstance(value, list) else {}
+                shorten_value(value, value_shortened)
                 value = value_shortened
                 logging.warning('Shortened the value of %s %s', self.name, self.attributes)
         elif isinstance(value, str):  # To shorten value if over LIMIT_SIZE characters
             value = value[:LIMIT_SIZE]
         self.value = value
+        Node.touch()  # Never compare values: they may be cyclic (e.g., a.prototype.constructor)
 
     def set_update_value(self, update_value):
         self.update_value = update_value
 
+    def add_provenance_children(self, candidates):
+        if not self.provenance_children:
+            self.provenance_children, self.provenance_children_set = [], set()
+        add_new(self.provenance_children, self.provenance_children_set, candidates)
+
+    def add_provenance_parents(self, candidates):
+        if not self.provenance_parents:
+            self.provenance_parents, self.provenance_parents_set = [], set()
+        add_new(self.provenance_parents, self.provenance_parents_set, candidates)
+
     def set_provenance_dd(self, extremity):  # Set Node provenance, set_data_dependency case
         # self is the origin of the DD while extremity is the destination of the DD
-        if extremity.provenance_children:
-            for child in extremity.provenance_children:
-                if child not in self.provenance_children_set:
-                    self.provenance_children_set.add(child)
-                    self.provenance_children.append(child)
-        else:
-            if extremity not in self.provenance_children_set:
-                self.provenance_children_set.add(extremity)
-                self.provenance_children.append(extremity)
-        if self.provenance_parents:
-            for parent in self.provenance_parents:
-                if parent not in extremity.provenance_parents_set:
-                    extremity.provenance_parents_set.add(parent)
-                    extremity.provenance_parents.append(parent)
-        else:
-            if self not in extremity.provenance_parents_set:
-                extremity.provenance_parents_set.add(self)
-                extremity.provenance_parents.append(self)
+        self.add_provenance_children(extremity.provenance_children or (extremity,))
+        extremity.add_provenance_parents(self.provenance_parents or (self,))
 
     def set_provenance(self, extremity):  # Set Node provenance, computed value case
         """
         a.b = c
         """
-        if extremity in self.seen_provenance:
-            pass
-        self.seen_provenance.add(extremity)
+        stack = [extremity]  # Non-Value Nodes: their descendants are also considered
+        while stack:
+            extremity = stack.pop()
+            if self.set_provenance_one(extremity):
+                stack.extend(reversed(extremity.children))
+
+    def set_provenance_one(self, extremity):
+        """ Provenance from extremity only, returns True if its children should be considered
+        too. """
         # extremity was leveraged to compute the value of self
         if not isinstance(extremity, Node):  # extremity is None:
-            if self not in self.provenance_parents_set:
-                self.provenance_parents_set.add(self)
-                self.provenance_parents.append(self)
+            self.add_provenance_parents((self,))
         elif isinstance(extremity, Value):
-            if extremity.provenance_parents:
-                for parent in extremity.provenance_parents:
-                    if parent not in self.provenance_parents_set:
-                        self.provenance_parents_set.add(parent)
-                        self.provenance_parents.append(parent)
-            else:
-                if extremity not in self.provenance_parents_set:
-                    self.provenance_parents_set.add(extremity)
-                    self.provenance_parents.append(extremity)
-            if self.provenance_children:
-                for child in self.provenance_children:
-                    if child not in extremity.provenance_children_set:
-                        extremity.provenance_children_set.add(child)
-                        extremity.provenance_children.append(child)
-            else:
-                if self not in extremity.provenance_children_set:
-                    extremity.provenance_children_set.add(self)
-                    extremity.provenance_children.append(self)
+            self.add_provenance_parents(extremity.provenance_parents or (extremity,))
+            extremity.add_provenance_children(self.provenance_children or (self,))
         elif isinstance(extremity, Node):  # Otherwise very restrictive
-            self.provenance_parents_set.add(extremity)
-            self.provenance_parents.append(extremity)
-            for extremity_child in extremity.children:  # Not necessarily useful
-                self.set_provenance(extremity_child)
+            self.add_provenance_parents((extremity,))
+            # Not necessarily useful. Even if extremity was already seen, its Value descendants
+            # may have new provenance since
+            return True
+        return False
 
     def set_provenance_rec(self, extremity):
-        self.set_provenance(extremity)
-        for child in extremity.children:
-            self.set_provenance_rec(child)
+        stack = [extremity]
+        while stack:
+            extremity = stack.pop()
+            self.set_provenance(extremity)
+            stack.extend(reversed(extremity.children))
 
 
 class Identifier(Node, Value):
     """ Identifier Nodes. DD is on Identifier nodes. """
 
+    __slots__ = VALUE_SLOTS + ('code', 'fun', 'data_dep_parents', 'data_dep_children',
+                               'data_dep_children_set')
+
     def __init__(self, name, parent):
         Node.__init__(self, name, parent)
         Value.__init__(self)
+        self.kind = KIND_IDENT
         self.code = None
         self.fun = None
-        self.data_dep_parents = []
-        self.data_dep_children = []
+        self.data_dep_parents = ()  # Empty tuples/frozenset, replaced on first use
+        self.data_dep_children = ()
+        self.data_dep_children_set = frozenset()  # Extremities of data_dep_children
 
     def set_code(self, code):
         self.code = code
@@ -359,7 +442,12 @@ class Identifier(Node, Value):
         self.fun = fun
 
     def set_data_dependency(self, extremity, nearest_statement=None):
-        if extremity not in [el.extremity for el in self.data_dep_children]:  # Avoids duplicates
+        if extremity not in self.data_dep_children_set:  # Avoids duplicates
+            if not self.data_dep_children:
+                self.data_dep_children, self.data_dep_children_set = [], set()
+            if not extremity.data_dep_parents:
+                extremity.data_dep_parents = []
+            self.data_dep_children_set.add(extremity)
             self.data_dep_children.append(Dependence('data dependency', extremity, 'data',
                                                      nearest_statement))
             extremity.data_dep_parents.append(Dependence('data dependency', self, 'data',
@@ -370,6 +458,8 @@ class Identifier(Node, Value):
 class ValueExpr(Node, Value):
     """ Nodes from VALUE_EXPR which therefore have a value that should be stored. """
 
+    __slots__ = VALUE_SLOTS
+
     def __init__(self, name, parent):
         Node.__init__(self, name, parent)
         Value.__init__(self)
@@ -378,8 +468,11 @@ class ValueExpr(Node, Value):
 class Statement(Node):
     """ Statement Nodes, see STATEMENTS. """
 
+    __slots__ = ('control_dep_parents', 'control_dep_children')
+
     def __init__(self, name, parent):
         Node.__init__(self, name, parent)
+        self.kind = KIND_STMT
         self.control_dep_parents = []
         self.control_dep_children = []
 
@@ -391,19 +484,20 @@ class Statement(Node):
             logging.debug('Unable to build a CF to go up the tree: %s', e)
 
     def remove_control_dependency(self, extremity):
-        for i, _ in enumerate(self.control_dep_children):
-            elt = self.control_dep_children[i]
-            if elt.extremity.id == extremity.id:
-                del self.control_dep_children[i]
-                try:
-                    del extremity.control_dep_parents[i]
-                except AttributeError as e:
-                    logging.debug('No CF going up the tree to delete: %s', e)
+        self.control_dep_children = [elt for elt in self.control_dep_children
+                                     if elt.extremity.id != extremity.id]
+        try:  # The parent side has its own indices, the entries pointing to self are removed
+            extremity.control_dep_parents = [elt for elt in extremity.control_dep_parents
+                                             if elt.extremity.id != self.id]
+        except AttributeError as e:
+            logging.debug('No CF going up the tree to delete: %s', e)
 
 
 class ReturnStatement(Statement, Value):
     """ ReturnStatement Node. It is a Statement that also has the attributes of a Value. """
 
+    __slots__ = VALUE_SLOTS
+
     def __init__(self, name, parent):
         Statement.__init__(self, name, parent)
         Value.__init__(self)
@@ -412,6 +506,8 @@ class ReturnStatement(Statement, Value):
 class Function:
     """ To store function related information. """
 
+    __slots__ = ()
+
     def __init__(self):
         self.fun_name = None
         self.fun_params = []
@@ -421,6 +517,7 @@ class Function:
 
     def set_fun_name(self, fun_name):
         self.fun_name = fun_name
+        Node.touch()
         fun_name.set_fun(self)  # Identifier fun_name has a handler to the function declaration self
 
     def add_fun_param(self, fun_param):
@@ -429,10 +526,8 @@ class Function:
     def add_fun_return(self, fun_return):
         # if fun_return.id not in [el.id for el in self.fun_return]:  # Avoids duplicates
         # Duplicates are okay, because we only consider the last return value from the list
-        return_id_list = [el.id for el in self.fun_return]
-        if not return_id_list:
-            self.fun_return.append(fun_return)
-        elif fun_return.id != return_id_list[-1]:  # Avoids duplicates if already considered one
+        # Avoids duplicates if already considered one
+        if not self.fun_return or fun_return.id != self.fun_return[-1].id:
             self.fun_return.append(fun_return)
 
     def set_retraverse(self):
@@ -445,6 +540,8 @@ class Function:
 class FunctionDeclaration(Statement, Function):
     """ FunctionDeclaration Node. It is a Statement that also has the attributes of a Function. """
 
+    __slots__ = FUNCTION_SLOTS
+
     def __init__(self, name, parent):
         Statement.__init__(self, name, parent)
         Function.__init__(self)
@@ -453,6 +550,8 @@ class FunctionDeclaration(Statement, Function):
 class FunctionExpression(Node, Function):
     """ FunctionExpression and ArrowFunctionExpression Nodes. Have the attributes of a Function. """
 
+    __slots__ = FUNCTION_SLOTS + ('fun_intern_name',)
+
     def __init__(self, name, parent):
         Node.__init__(self, name, parent)
         Function.__init__(self)
@@ -34,7 +34,7 @@ var process = require("process");
  * Extraction of the AST of an input JS file using Esprima.
  *
  * @param js
- * @param json_path
+ * @param json_path, or '1' to write the AST to stdout
  * @returns {*}
  */
 function js2ast(js, json_path) {
@@ -55,6 +55,12 @@ function js2ast(js, json_path) {
     // Attaching comments is a separate step for Escodegen
     ast = es.attachComments(ast, ast.comments, ast.tokens);
 
+    if (json_path === '1') {
+        // No file asked for, the AST is read from stdout
+        process.stdout.write(JSON.stringify(ast));
+        return ast;
+    }
+
     fs.mkdirSync(path.dirname(json_path), {recursive: true});
     fs.writeFile(json_path, JSON.stringify(ast), function (err) {
         if (err) {
@@ -21,9 +21,15 @@
 import logging
 
 from . import js_operators
-from .value_filters import get_node_computed_value, display_values
+from .value_filters import get_node_computed_value, display_values, DISPLAY_VAR
 from . import node as _node
 
+# Nodes from which map_var2value computes values
+VAR_ASSIGNMENTS = frozenset(('VariableDeclarator', 'AssignmentExpression', 'Property'))
+# Values that can be mapped to a single Identifier, cf. find_node
+ASYMMETRIC_VALUES = frozenset(('ArrayExpression', 'ObjectExpression', 'ObjectPattern',
+                               'NewExpression'))
+
 
 """
 In the following and if not stated otherwise,
@@ -49,16 +55,20 @@ def get_node_path(begin_node, destination_node, path):
             Ex: [0, 0, 1] <=> begin_node.children[0].children[0].children[1] = destination_node.
     """
 
-    if begin_node.id == destination_node.id:
-        return True
-
-    for i, _ in enumerate(begin_node.children):
-        path.append(i)  # Child number i
-        found = get_node_path(begin_node.children[i], destination_node, path)
-        if found:
-            return True
-        del path[-1]
-    return False
+    # Goes up from destination_node, instead of searching the whole begin_node subtree
+    reversed_path = []
+    node = destination_node
+    while node.id != begin_node.id:
+        parent = node.parent
+        if parent is None:  # destination_node is not a descendant of begin_node
+            return False
+        try:
+            reversed_path.append(parent.children.index(node))  # Child number i
+        except ValueError:  # Not a child of its parent, e.g., comments
+            return False
+        node = parent
+    path.extend(reversed(reversed_path))
+    return True
 
 
 def find_node(var, begin_node, path):
@@ -78,7 +88,7 @@ def find_node(var, begin_node, path):
 
     # Case Asymmetric mapping, e.g., Identifier mapped to an Array or else
     logging.debug('Asymmetric mapping case')
-    if begin_node.name in ('ArrayExpression', 'ObjectExpression', 'ObjectPattern', 'NewExpression'):
+    if begin_node.name in ASYMMETRIC_VALUES:
         value = begin_node
         logging.debug('The value corresponds to node %s', value.name)
         return None, value
@@ -97,7 +107,7 @@ def get_member_expression(node):
 
     while node.parent.name == 'MemberExpression':
         if node.parent.children[0].name == 'ThisExpression'\
-                or get_node_computed_value(node.parent.children[0]) in _node.GLOBAL_VAR:
+                or _node.is_global_var(get_node_computed_value(node.parent.children[0])):
             return False, node, True
         node = node.parent
     return True, node, False
@@ -119,19 +129,21 @@ def map_var2value(node, identifiers, operator=None):
         Trick: Symmetry between AST left-hand side (declaration) and right-hand side (value).
     """
 
-    if node.name != 'VariableDeclarator' and node.name != 'AssignmentExpression' \
-            and node.name != 'Property':
+    if node.name not in VAR_ASSIGNMENTS:
         # Could be called on other Nodes because of assignment_expr_df which calculates DD on
         # right-hand side elements which may not be variable declarations/assignments anymore
         return
 
     var = node.children[0]
     init = node.children[1]
+    # Skips evaluating the debug messages' arguments, e.g., attributes['name'], when not logged
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
 
     for decl in identifiers:
         # Compute the value for each decl, as it might have changed
-        logging.debug('Computing a value for the variable %s with id %s',
-                      decl.attributes['name'], decl.id)
+        if debug:
+            logging.debug('Computing a value for the variable %s with id %s',
+                          decl.attributes['name'], decl.id)
 
         decl.set_update_value(True)  # Will be updated when printed in display_temp
         member_expr, decl, this_window = get_member_expression(decl)
@@ -142,18 +154,20 @@ def map_var2value(node, identifiers, operator=None):
             path.pop()  # We jump over the MemberExpression parent to keep the symmetry
 
         if isinstance(init, _node.Identifier) and isinstance(init.value, _node.Node):
-            try:
-                logging.debug('The variable %s was initialized with the Identifier %s which already'
-                              ' has a value', decl.attributes['name'], init.attributes['name'])
-            except KeyError:
-                logging.debug('The variable %s was initialized with the Identifier %s which already'
-                              ' has a value', decl.name, init.name)
+            if debug:
+                try:
+                    logging.debug('The variable %s was initialized with the Identifier %s which'
+                                  ' already has a value', decl.attributes['name'],
+                                  init.attributes['name'])
+                except KeyError:
+                    logging.debug('The variable %s was initialized with the Identifier %s which'
+                                  ' already has a value', decl.name, init.name)
             value_node, value = find_node(var, init.value, path)
         else:
-            if isinstance(decl, _node.Identifier):
+            if debug and isinstance(decl, _node.Identifier):
                 logging.debug('The variable %s was not initialized with an Identifier or '
                               'it does not already have a value', decl.attributes['name'])
-            else:
+            elif debug:
                 logging.debug('The %s %s was not initialized with an Identifier or '
                               'it does not already have a value', decl.name, decl.attributes)
             value_node, value = find_node(var, init, path)
@@ -161,7 +175,7 @@ def map_var2value(node, identifiers, operator=None):
                 logging.debug('Got the node %s', value_node.name)
 
         if value is None:
-            if isinstance(decl, _node.Identifier):
+            if debug and isinstance(decl, _node.Identifier):
                 logging.debug('Calculating the value of the variable %s', decl.attributes['name'])
             else:
                 logging.debug('Calculating the value')
@@ -184,19 +198,20 @@ def map_var2value(node, identifiers, operator=None):
             decl.set_code(node)  # Add code
 
         if not member_expr:  # Standard case, assign the value to the Identifier node
-            logging.debug('Assigning the value %s to %s', value, decl.attributes['name'])
+            if debug:
+                logging.debug('Assigning the value %s to %s', value, decl.attributes['name'])
             decl.set_value(value)
             if isinstance(value_node, _node.FunctionExpression):
                 fun_name = decl
-                if value_node.fun_intern_name is not None:
+                if debug and value_node.fun_intern_name is not None:
                     logging.debug('The variable %s refers to the (Arrow)FunctionExpresion %s',
                                   fun_name.attributes['name'],
                                   value_node.fun_intern_name.attributes['name'])
-                else:
+                elif debug:
                     logging.debug('The variable %s refers to an anonymous (Arrow)FunctionExpresion',
                                   fun_name.attributes['name'])
                 value_node.set_fun_name(fun_name)
-            else:
+            elif DISPLAY_VAR:
                 display_values(decl)  # Displays values
         else:  # MemberExpression case
             logging.debug('MemberExpression case')
@@ -205,13 +220,15 @@ def map_var2value(node, identifiers, operator=None):
                 logging.debug('The object was defined, set the value of its property')
                 literal_value.set_value(value)  # Modifies value of the node referencing the MemExpr
                 literal_value.set_provenance_rec(value_node)  # Updates provenance
-                display_values(literal_value)  # Displays values
+                if DISPLAY_VAR:
+                    display_values(literal_value)  # Displays values
             else:  # The object is probably a built-in object therefore no handle to get its prop
                 logging.debug('The object was not defined, stored its property and set its value')
                 obj, all_prop = define_obj_properties(decl, value, initial_node=decl)
                 obj.set_value(all_prop)
                 obj.set_provenance_rec(value_node)  # Updates provenance
-                display_values(obj)
+                if DISPLAY_VAR:
+                    display_values(obj)
 
 
 def compute_update_expression(node, identifier):
@@ -236,12 +253,13 @@ def update_member_expression(member_expression_node, initial_node):
 def search_properties(node, tab):
     """ Searches the Identifier/Literal nodes properties of a MemberExpression node. """
 
-    if node.name in ('Identifier', 'Literal'):
-        if get_node_computed_value(node) not in _node.GLOBAL_VAR:  # do nothing if window &co
-            tab.append(node)  # store left member as not window &co
-
-    for child in node.children:
-        search_properties(child, tab)
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.name in ('Identifier', 'Literal'):
+            if not _node.is_global_var(get_node_computed_value(node)):  # do nothing if window &co
+                tab.append(node)  # store left member as not window &co
+        stack.extend(reversed(node.children))
 
 
 def define_obj_properties(member_expression_node, value, initial_node):
@@ -253,9 +271,8 @@ def define_obj_properties(member_expression_node, value, initial_node):
     obj = properties[0]
     obj_init = get_node_computed_value(obj, initial_node=initial_node)
     # The obj may already have some properties
-    properties = properties[1:]
-    properties_value = [get_node_computed_value(prop,
-                                                initial_node=initial_node) for prop in properties]
+    properties_value = [get_node_computed_value(properties[i], initial_node)  # initial_node
+                        for i in range(1, len(properties))]
 
     # Good for debugging to see dict content, but cannot be used as loses link to variables
     # if isinstance(value, _node.Node):
@@ -269,11 +286,12 @@ def define_obj_properties(member_expression_node, value, initial_node):
     else:
         all_prop = {}  # initialize with empty dict
     previous_prop = all_prop
-    for i in range(len(properties_value) - 1):
-        prop = properties_value[i]
-        if prop not in previous_prop or not isinstance(previous_prop[prop], dict):
-            previous_prop[prop] = {}  # previous_prop[prop] does not already exist
-        previous_prop = previous_prop[prop]
+    for prop in properties_value[:-1]:
+        next_prop = previous_prop.get(prop)
+        if not isinstance(next_prop, dict):
+            next_prop = previous_prop[prop] = {}  # previous_prop[prop] does not already exist
+        previous_prop = next_prop
     previous_prop[properties_value[-1]] = value  # prop0.prop1.prop2... = value
+    _node.Node.touch()  # all_prop may be obj's current value, changed in place
 
     return obj, all_prop
@@ -18,12 +18,13 @@
     Definition of class Scope to handle JS scoping rules.
 """
 
-import copy
-
 
 class Scope:
     """ To apply JS scoping rules. """
 
+    __slots__ = ('name', 'var_list', 'var_if2_list', 'unknown_var', 'function', 'bloc',
+                 'var_names')
+
     def __init__(self, name=''):
         self.name = name
         self.var_list = []
@@ -31,15 +32,16 @@ class Scope:
         self.unknown_var = set()  # Unknown variable in a given scope
         self.function = None
         self.bloc = False  # Indicates if we are in a block statement
-        self.need_to_recompute_var_list = True
-        self.id_name_list = set()
+        self.var_names = {}  # Variable name -> position of its first occurrence in var_list
 
     def set_name(self, name):
         self.name = name
 
     def set_var_list(self, var_list):
         self.var_list = var_list
-        self.need_to_recompute_var_list = True
+        self.var_names = {}
+        for i, elt in enumerate(var_list):
+            self.var_names.setdefault(elt.attributes['name'], i)
 
     def set_var_if2_list(self, var_if2_list):
         self.var_if2_list = var_if2_list
@@ -51,8 +53,8 @@ class Scope:
         self.function = function
 
     def add_var(self, identifier_node):
+        self.var_names.setdefault(identifier_node.attributes['name'], len(self.var_list))
         self.var_list.append(identifier_node)
-        self.need_to_recompute_var_list = True
         self.var_if2_list.append(None)
 
     def add_unknown_var(self, unknown):
@@ -62,8 +64,10 @@ class Scope:
         self.unknown_var.remove(unknown)
 
     def update_var(self, index, identifier_node):
+        old_name = self.var_list[index].attributes['name']
         self.var_list[index] = identifier_node
-        self.need_to_recompute_var_list = True
+        if old_name != identifier_node.attributes['name']:  # Rare, recomputes the positions
+            self.set_var_list(self.var_list)
         self.var_if2_list[index] = None
 
     def update_var_if2(self, index, identifier_node_list):
@@ -75,31 +79,21 @@ class Scope:
         self.var_if2_list[index].append(identifier_node)
 
     def is_equal(self, var_list2):
-        if self.var_list == var_list2.var_list and self.var_if2_list == var_list2.var_if2_list:
-            return True
-        return False
+        # Nodes have no __eq__: identity comparisons, stopping at the first different length/node
+        return self.var_list == var_list2.var_list and self.var_if2_list == var_list2.var_if2_list
 
     def copy_scope(self):
-        scope = Scope()
-        scope.set_name(copy.copy(self.name))
-        scope.set_var_list(copy.copy(self.var_list))
-        scope.set_var_if2_list(copy.copy(self.var_if2_list))
-        scope.set_unknown_var(copy.copy(self.unknown_var))
-        scope.set_function(copy.copy(self.function))
+        scope = Scope(self.name)
+        scope.var_list = list(self.var_list)
+        scope.var_names = dict(self.var_names)  # Same positions, no need to recompute them
+        scope.set_var_if2_list(list(self.var_if2_list))
+        scope.set_unknown_var(set(self.unknown_var))
+        scope.set_function(self.function)
         return scope
 
     def get_pos_identifier(self, identifier_node):
-        tmp_list = None
-        if self.need_to_recompute_var_list:
-            tmp_list = [elt.attributes['name'] for elt in self.var_list]
-            self.id_name_list = set(tmp_list)
-            self.need_to_recompute_var_list = False
-        var_name = identifier_node.attributes['name']
-        if var_name in self.id_name_list:
-            if tmp_list is None:
-                tmp_list = [elt.attributes['name'] for elt in self.var_list]
-            return tmp_list.index(var_name)  # Position of identifier_node in var_list
-        return None  # None if it is not in the list
+        # Position of identifier_node in var_list, None if it is not in the list
+        return self.var_names.get(identifier_node.attributes['name'])
 
     def set_in_bloc(self, bloc):
         self.bloc = bloc
@@ -1,40 +1,28 @@
 class Storage:
+    __slots__ = ('node', 'results', 'app_path', 'page_path', 'config', 'call_expr_cache', 'callee_cache',
+                 'method_index')
     instance = None
-    node = None
-    results = None
-    app_path = None
-    page_path = None
-    config = None
 
     def __init__(self, _node, _app_path, _path_path, _config):
         self.node = _node
         # data structure: {
         #   [page_name]: [
-        #     { method: [method_name],
-        #       source: [source_name],
-        #       sink:   [sink_name]
-        #     },
+        #     Flow(method=[method_name],
+        #          ident=[ident_name],
+        #          source=[source_name],
+        #          sink=[sink_name]),
         #   ]
         # }
         self.results = dict()
         self.app_path = _app_path
         self.page_path = _path_path
         self.config = _config
-
-    def get_node(self):
-        return self.node
-
-    def get_results(self):
-        return self.results
-
-    def get_app_path(self):
-        return self.app_path
-
-    def get_page_path(self):
-        return self.page_path
-
-    def get_config(self):
-        return self.config
+        # node -> its nearest CallExpression ancestor (or None), cf. find_nearest_call_expr_node
+        self.call_expr_cache = dict()
+        # CallExpression -> its callee name, cf. obtain_callee_from_call_expr
+        self.callee_cache = dict()
+        # page method name -> method node, built on the first lookup, cf. find_page_method_node
+        self.method_index = None
 
     @staticmethod
     def init(_node, _app_path, _page_path, _config):
@@ -43,3 +31,7 @@ class Storage:
     @staticmethod
     def get_instance():
         return Storage.instance
+
+    @staticmethod
+    def release():
+        Storage.instance = None
@@ -1,3 +1,4 @@
+import functools
 import os
 import time
 from .wxjs import gen_pdg, handle_wxjs
@@ -7,92 +8,103 @@ import multiprocessing as mp
 
 
 def filter_results(results, config):
+    # membership tests against sets, built once per call
+    sources = frozenset(config.get("sources") or ())
+    sinks = frozenset(config.get("sinks") or ())
     # no filters, just return
-    if ("sources" not in config or len(config["sources"]) == 0) and \
-            ("sinks" not in config or len(config["sinks"]) == 0):
+    if not sources and not sinks:
         return results
 
+    # handle double binding in source
+    double_binding = "[double_binding]" in sources
+
     filtered = {}
-    for page in results:
-        filtered[page] = []
-        for flow in results[page]:
-            # filter source
-            if "sources" in config and len(config["sources"]) > 0:
-                if "sinks" in config and len(config["sinks"]) > 0:
-                    # apply source and sink filter
-                    if flow['source'] in config["sources"] and flow['sink'] in config["sinks"]:
-                        filtered[page].append(flow)
-                    # handle double binding in source
-                    if "[double_binding]" in config["sources"] and "[data from" in flow['source'] \
-                            and flow['sink'] in config["sinks"]:
-                        filtered[page].append(flow)
-                else:
-                    # no sink filter, just apply source filter
-                    if flow['sink'] in config["sinks"]:
-                        filtered[page].append(flow)
-            else:
-                # no source filter, apply sink filter
-                if "sinks" in config and len(config["sinks"]) > 0:
-                    # apply sink filter
-                    if flow['sink'] in config["sinks"]:
-                        filtered[page].append(flow)
-        # remove empty entries
-        if len(filtered[page]) == 0:
-            filtered.pop(page)
+    for page, flows in results.items():
+        if sources and sinks:
+            # apply source and sink filter
+            out = [flow for flow in flows
+                   if (flow.source in sources or (double_binding and "[data from" in flow.source))
+                   and flow.sink in sinks]
+        elif sources:
+            # no sink filter, just apply source filter
+            out = [flow for flow in flows
+                   if flow.source in sources or (double_binding and "[data from" in flow.source)]
+        else:
+            # no source filter, apply sink filter
+            out = [flow for flow in flows if flow.sink in sinks]
+        # skip empty entries
+        if out:
+            filtered[page] = out
     return filtered
 
 
-def analyze_worker(app_path, page_path, results_path, config, queue):
-    # generate pdg first
-    r = gen_pdg(os.path.join(app_path, "pages", f"{page_path}.js"), results_path)
-    # init shared storage (per process)
-    Storage.init(r, app_path, page_path, config)
-    # analyze double binding
-    handle_wxml(os.path.join(app_path, "pages", f"{page_path}.wxml"))
-    # analyze data flow
-    handle_wxjs(r)
-    # retrieve results
-    results = Storage.get_instance().get_results()
-    # filter results
-    filtered = filter_results(results, config)
-    # send results
-    queue.put(filtered)
-
-
-def analyze_listener(result_path, queue):
-    with open(result_path, "w") as f:
-        f.write("page_name | page_method | ident | source | sink\n")
-        while True:
-            message = queue.get()
-            if message == "kill":
-                break
-            if isinstance(message, dict):
-                for page in message:
-                    for flow in message[page]:
-                        f.write(f"{page} | {flow['method']} | {flow['ident']} | {flow['source']} | {flow['sink']}\n")
-                f.flush()
-        f.flush()
+def analyze_worker(app_path, page_path, results_path, config, dump_intermediates=False, pdg_cache=False):
+    begin_time = int(time.time())
+    try:
+        # generate pdg first
+        r = gen_pdg(os.path.join(app_path, "pages", f"{page_path}.js"), results_path, dump_intermediates,
+                    pdg_cache)
+        # init shared storage (per process)
+        Storage.init(r, app_path, page_path, config)
+        # analyze double binding
+        handle_wxml(os.path.join(app_path, "pages", f"{page_path}.wxml"))
+        # analyze data flow
+        handle_wxjs(r)
+        # retrieve results
+        results = Storage.get_instance().results
+        # filter results
+        filtered = filter_results(results, config)
+    except Exception as e:
+        # caught here: an exception would stop the unordered iteration of all the pages
+        print(f"[main] critical error: {e}")
+        filtered = None
+    finally:
+        # do not keep this page's PDG alive while building the next one
+        Storage.release()
+    # return results, only this page's flows are held until written
+    return page_path, filtered, begin_time, int(time.time())
+
+
+def format_results(filtered):
+    # the whole page is formatted and encoded once, then written in one call
+    return "".join(f"{page} | {flow.method} | {flow.ident} | {flow.source} | {flow.sink}\n"
+                   for page, flows in filtered.items() for flow in flows).encode("utf-8")
 
 
 def obtain_valid_page(files):
-    sub_pages = set()
+    # group the page files by stem: a page needs both its .js and .wxml
+    stems = dict()
     for f in files:
-        sub_pages.add(str.split(f, ".")[0])
-    for f in list(sub_pages):
-        if f"{f}.js" not in files or f"{f}.wxml" not in files:
-            sub_pages.remove(f)
-    return sub_pages
+        stem, _, ext = f.rpartition(".")
+        if ext == "js" or ext == "wxml":
+            stems.setdefault(stem, set()).add(ext)
+    return {s for s, exts in stems.items() if len(exts) == 2}
 
 
 def retrieve_pages(app_path):
+    pages_path = os.path.join(app_path, "pages/")
     pages = set()
-    for root, dirs, files in os.walk(os.path.join(app_path, "pages/")):
+    # scandir gives the entry types from the directory listing, without a stat per file
+    dirs = [pages_path]
+    while dirs:
+        root = dirs.pop()
+        files = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        files.append(entry.name)
+                    elif not entry.is_symlink():  # as os.walk, do not follow directory links
+                        dirs.append(entry.path)
+        except OSError:
+            continue
         for s in obtain_valid_page(files):
-            pages.add(f"{root[len(os.path.join(app_path, 'pages/')):]}/{s}")
+            pages.add(f"{root[len(pages_path):]}/{s}")
     return pages
 
 
-def analyze_mini_program(app_path, results_path, config, workers, bench):
+def analyze_mini_program(app_path, results_path, config, workers, bench, dump_intermediates=False,
+                         pdg_cache=False):
     if not os.path.exists(app_path):
         print("[main] invalid app path")
 
@@ -109,41 +121,29 @@ def analyze_mini_program(app_path, results_path, config, workers, bench):
         print(f"[main] error: invalid output path")
         return
 
-    manager = mp.Manager()
-    queue = manager.Queue()
-    pool = mp.Pool(workers if workers is not None else mp.cpu_count())
-
-    # put listener to pool first
-    pool.apply_async(analyze_listener, (os.path.join(results_path, f"{os.path.basename(app_path)}-result.csv"), queue))
+    n_workers = workers if workers is not None else mp.cpu_count()
+    pool = mp.Pool(n_workers)
+    # a few pages per task, handed out as workers free up: bounded in-flight work and results
+    chunksize = max(1, len(pages) // (n_workers * 4))
+    worker = functools.partial(analyze_worker, app_path, results_path=results_path, config=config,
+                               dump_intermediates=dump_intermediates, pdg_cache=pdg_cache)
+
+    # execute workers and write results as pages complete
+    bench_times = dict()
+    # large buffer, flushed when closing: no write syscall per page
+    with open(os.path.join(results_path, f"{os.path.basename(app_path)}-result.csv"), "wb",
+              buffering=1024 * 1024) as f:
+        f.write(b"page_name | page_method | ident | source | sink\n")
+        for page_path, filtered, begin_time, end_time in pool.imap_unordered(worker, pages, chunksize):
+            if filtered:
+                f.write(format_results(filtered))
+            bench_times[page_path] = (begin_time, end_time)
 
-    bench_out = None
-    if bench:
-        bench_out = open(os.path.join(results_path, f"{os.path.basename(app_path)}-bench.csv"), "w")
-        bench_out.write("page|start|end\n")
-
-    # execute workers
-    workers = dict()
-    for p in pages:
-        workers[p] = dict()
-        workers[p]["job"] = pool.apply_async(analyze_worker, (app_path, p, results_path, config, queue))
-        if bench:
-            workers[p]["begin_time"] = int(time.time())
-
-    # collect results
-    for p in pages:
-        try:
-            workers[p]["job"].get()
-        except Exception as e:
-            print(f"[main] critical error: {e}")
-        finally:
-            if bench:
-                workers[p]["end_time"] = int(time.time())
-
-    queue.put("kill")
     pool.close()
     pool.join()
 
-    if bench and bench_out is not None:
-        for p in pages:
-            bench_out.write(f"{p}|{workers[p]['begin_time']}|{workers[p]['end_time']}\n")
-        bench_out.close()
+    if bench:
+        with open(os.path.join(results_path, f"{os.path.basename(app_path)}-bench.csv"), "w") as bench_out:
+            bench_out.write("page|start|end\n")
+            for p in pages:
+                bench_out.write(f"{p}|{bench_times[p][0]}|{bench_times[p][1]}\n")
@@ -1,16 +1,75 @@
-from collections import deque
+import hashlib
+import os
+import pickle
+from collections import namedtuple
 from pdg_js import node as _node
+from pdg_js import js_operators
 from pdg_js.build_pdg import get_data_flow
 from .storage import Storage
 
+# one taint flow of a page; a tuple pickles smaller than a dict when returned by the pool workers
+Flow = namedtuple("Flow", ("method", "ident", "source", "sink"))
 
-def gen_pdg(file_path, results_path):
-    return get_data_flow(file_path, benchmarks=dict(), alt_json_path=f"{results_path}/intermediate-data/")
+
+# part of the pdg cache header: bump it when the pickled PDG changes, e.g., pdg_js node attributes
+PDG_CACHE_VERSION = 1
+
+
+def gen_pdg(file_path, results_path, dump_intermediates=False, pdg_cache=False):
+    cache_path = key = None
+    if pdg_cache:
+        # the PDG only depends on the js file: reuse the one of a previous run if the file did not change
+        cache_path = os.path.join(results_path, "pdg-cache",
+                                  f"{hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()}.pkl")
+        stat = os.stat(file_path)
+        key = (PDG_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+        r = load_cached_pdg(cache_path, key)
+        if r is not None:
+            return r
+
+    benchmarks = dict()
+    # Esprima's JSON AST only goes to intermediate-data when asked for, otherwise through a pipe
+    r = get_data_flow(file_path, benchmarks=benchmarks, alt_json_path=f"{results_path}/intermediate-data/",
+                      store_json=dump_intermediates)
+    # do not keep parsing errors or timeouts
+    if pdg_cache and not benchmarks["errors"]:
+        store_cached_pdg(cache_path, key, r)
+    return r
+
+
+def load_cached_pdg(cache_path, key):
+    try:
+        with open(cache_path, "rb") as f:
+            if pickle.load(f) == key:
+                js_operators.clear_caches()  # as get_data_flow does, do not keep the previous PDG alive
+                return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[wxjs] ignoring invalid pdg cache {cache_path}: {e}")
+    return None
+
+
+def store_cached_pdg(cache_path, key, r):
+    tmp_path = f"{cache_path}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(key, f)
+            pickle.dump(r, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        # the page is still analyzed, only the next run has to build its PDG again
+        print(f"[wxjs] could not store pdg cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 
 def handle_wxjs(r):
-    results = Storage.get_instance().get_results()
-    results[Storage.get_instance().get_page_path()] = list()
+    storage = Storage.get_instance()
+    storage.results[storage.page_path] = list()
     find_page_methods_node(r)
 
 
@@ -34,23 +93,48 @@ def find_page_methods_node(r):
 
 
 def find_nearest_call_expr_node(node):
-    return node if node is not None and \
-                   hasattr(node, "name") and isinstance(node, _node.ValueExpr) and node.name == "CallExpression" \
-                   else find_nearest_call_expr_node(node.parent if node.parent is not None else None)
+    # the answer is shared by all the nodes walked, remember it for each of them
+    cache = Storage.get_instance().call_expr_cache
+    walked = []
+    found = None
+    while node is not None:
+        if node in cache:
+            found = cache[node]
+            break
+        if isinstance(node, _node.ValueExpr) and node.name == "CallExpression":
+            found = node
+            break
+        walked.append(node)
+        node = node.parent
+    for n in walked:
+        cache[n] = found
+    return found
+
+
+def join_names(nodes):
+    # dotted name of nodes, unnamed ones (e.g., this) are left empty
+    return ".".join([i.attributes.get("name", "") for i in nodes])
 
 
 def obtain_callee_from_call_expr(node):
-    if len(node.children[0].children) == 0 and node.children[0].attributes["name"] != "Page":
-        return node.children[0].attributes["name"]
-    return ".".join([i.attributes["name"] if "name" in i.attributes else "" for i in node.children[0].children])
+    # the same call is resolved for each of its identifiers, remember its callee
+    cache = Storage.get_instance().callee_cache
+    if node in cache:
+        return cache[node]
+    callee = node.children[0]
+    name = callee.attributes.get("name")
+    if callee.children or name == "Page":
+        name = join_names(callee.children)
+    cache[node] = name
+    return name
 
 
 def obtain_var_decl_callee(node):
-    return ".".join([i.attributes["name"] for i in node.children[0].children])
+    return join_names(node.children[0].children)
 
 
 def obtain_value_expr_callee(node):
-    return ".".join([i.attributes["name"] for i in node.children])
+    return join_names(node.children)
 
 
 def obtain_data_flow_sink(dep):
@@ -82,8 +166,8 @@ def handle_data_parent_node(node):
 
 
 def is_parent_var_decl_or_assign_expr(node):
-    return isinstance(node.parent, _node.Node) and \
-           hasattr(node.parent, "name") and \
+    # parent is either None or a Node, which always has a name
+    return node.parent is not None and \
            (node.parent.name == "VariableDeclarator" or node.parent.name == "AssignmentExpression")
 
 
@@ -95,7 +179,7 @@ def check_immediate_data_dep_parent(node):
         # variable declaration or assignment, check the call expr
         if len(node.parent.children) > 1 and isinstance(node.parent.children[1], _node.ValueExpr):
             # obtain callee if parent is call expr
-            if hasattr(node.parent.children[1], "name") and node.parent.children[1].name == "CallExpression":
+            if node.parent.children[1].name == "CallExpression":
                 source = obtain_callee_from_call_expr(node.parent.children[1])
 
             # obtain callee if parent is var decl
@@ -110,20 +194,18 @@ def is_page_method_parameter(node):
         return False
     # in AST tree, ident -> FunctionExpr -> Property -> ObjectExpr
     # -> CallExpr <- Ident (Page)
-    try:
-        if node.parent.parent.parent.parent \
-                .children[0].attributes["name"] == "Page":
-            return True
-    except IndexError:
-        return False
-    except AttributeError:
-        return False
-    except KeyError:
-        return False
+    # explicit checks: most identifiers are not page method parameters, no exception raised for them
+    call_expr = node
+    for _ in range(4):
+        call_expr = call_expr.parent
+        if call_expr is None:
+            return False
+    return len(call_expr.children) > 0 and call_expr.children[0].attributes.get("name") == "Page"
 
 
 def get_input_name(value):
-    return value[value.rindex(".") + 1:] if isinstance(value, str) and "detail.value" in value else None
+    # name after the last dot, e.g., e.detail.value.[id]
+    return value.rpartition(".")[2] if isinstance(value, str) and "detail.value" in value else None
 
 
 def handle_page_method_parameter(node, _n):
@@ -172,50 +254,55 @@ def handle_data_dep_parents(node):
         return {source}
 
     sources = set()
+    # identifiers with the same AST parent resolve to the same source: resolve it once per parent
+    resolved = dict()
     # no call expr found, search from provenance parents
     for n in node.provenance_parents_set:
-        # check ident
-        if isinstance(n, _node.Identifier):
-            # check if it's page method parameter first
-            if is_page_method_parameter(n):
-                # is page method parameter, handle double binding
-                # notice here should analyze the original node,
-                # not the provenance parent node
-                r = handle_page_method_parameter(node, n)
-                if r is not None:
-                    sources.update(r)
-                continue
+        # check ident, normal nodes and value exprs are not handled
+        # kind tag: an int compare instead of isinstance, cf. pdg_js.node
+        if n.kind != _node.KIND_IDENT:
+            continue
+        # check if it's page method parameter first
+        if is_page_method_parameter(n):
+            # is page method parameter, handle double binding
+            # notice here should analyze the original node,
+            # not the provenance parent node
+            r = handle_page_method_parameter(node, n)
+            if r is not None:
+                sources.update(r)
+            continue
 
+        if n.parent in resolved:
+            r = resolved[n.parent]
+        else:
             # search for source from var decl or assignment expr
             r = check_immediate_data_dep_parent(n)
             if r is None:
                 # no results found, fall back to general search
                 r = obtain_callee_from_call_expr(find_nearest_call_expr_node(n))
+            resolved[n.parent] = r
 
-            # still no results
-            if r is None or r == "":
-                continue
-            # found source, add to set
-            sources.add(r)
-        # normal node, don't handle it
-        if isinstance(n, _node.Node):
-            continue
-        # value expr, don't handle it
-        if isinstance(n, _node.ValueExpr):
+        # still no results
+        if r is None or r == "":
             continue
+        # found source, add to set
+        sources.add(r)
     # end for
     return sources
 
 
 def handle_data_child_node(node, method_name):
-    if hasattr(node, "data_dep_children") and len(node.data_dep_children) > 0:
+    # only called on identifiers, which always have data dependencies
+    if node.data_dep_children:
         # this node has data dep children (intermediate node), won't handle it
         return
 
     # no more children, it's the last node of the data flow
     # resolve sink api if the parent node is call expr
-    sink = obtain_callee_from_call_expr(find_nearest_call_expr_node(node))
-    if sink == "":
+    call_expr_node = find_nearest_call_expr_node(node)
+    # not used in any call: no sink, skip the source resolution
+    sink = obtain_callee_from_call_expr(call_expr_node) if call_expr_node is not None else None
+    if sink is None or sink == "":
         print(f"[taint sink] no sink api resolved, passing...")
         return
     print(f"[taint sink] got data flow sink: {sink}, resolving data flow source")
@@ -238,14 +325,10 @@ def handle_data_child_node(node, method_name):
         print(f"[flow path] data identifier: {node.attributes['name']}, "
               f"from source: {', '.join(sources)}, "
               f"to sink: {sink}")
-        results = Storage.get_instance().get_results()
+        storage = Storage.get_instance()
+        page_results = storage.results[storage.page_path]
         for s in sources:
-            results[Storage.get_instance().get_page_path()].append({
-                "method": method_name,
-                "ident": node.attributes['name'],
-                "source": s,
-                "sink": sink
-            })
+            page_results.append(Flow(method_name, node.attributes['name'], s, sink))
 
 
 def handle_identifier_node(node, method_name):
@@ -254,37 +337,24 @@ def handle_identifier_node(node, method_name):
     #     handle_data_parent_node(node)
 
     # search backwards (from children)
-    if hasattr(node, "data_dep_parents") and len(node.data_dep_parents) > 0:
+    if node.data_dep_parents:
         print("[handle ident] got data flow child node")
         # omit backwards search
         handle_data_child_node(node, method_name)
 
 
-def dfs_visit(node, method_name):
-    if not isinstance(node, _node.Identifier):
-        # print("normal node, passing")
-        return
-
-    handle_identifier_node(node, method_name)
-
-
-def dfs_search(r, n):
-    stack = deque()
-    stack.append(r)
-
-    visited = []
-
+def iter_identifiers(r):
+    # the AST is a tree: each node is reached once, no visited set needed
+    stack = [r]
     while stack:
         v = stack.pop()
-        if v in visited:
-            continue
+        if v.kind == _node.KIND_IDENT:
+            yield v
+        # visit its children, in order
+        stack.extend(reversed(v.children))
 
-        # node is not visited
-        visited.append(v)
-        dfs_visit(v, n)
 
-        # visit its children
-        children = v.children
-        for i in reversed(children):
-            if i not in visited:
-                stack.append(i)
+def dfs_search(r, n):
+    # only identifiers are handled, other nodes are just walked through
+    for v in iter_identifiers(r):
+        handle_identifier_node(v, n)
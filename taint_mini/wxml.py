@@ -1,16 +1,30 @@
-from lxml.html import parse
+import os
+from lxml.etree import iterparse
 from .storage import Storage
 
 
 def handle_wxml(file):
     try:
-        wxml_html_root = parse(file)
-        visit_wxml_tree(wxml_html_root)
+        # an empty page has no form, but the parser would fail on it
+        if os.path.getsize(file) == 0:
+            return
+        # forms are handled as soon as they are parsed, the rest of the page is not kept in memory
+        for _, element in iterparse(file, events=("end",), tag=("g-form", "form"), html=True):
+            # as a form may have many child input elements
+            # a nested form is handled with its outermost form
+            if next(element.iterancestors("g-form", "form"), None) is not None:
+                continue
+            handle_wxml_form(element)
+            # free the form and what was parsed before it
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
     except Exception as e:
         print(f"[wxml] got error: {e}")
 
 
-def find_page_method_node(root, name):
+def build_page_method_index(root):
+    index = dict()
     for child in root.children:
         if child.name == "ExpressionStatement":
             if len(child.children) > 0 \
@@ -19,9 +33,17 @@ def find_page_method_node(root, name):
                 # found page expression
                 for method_node in child.children[0].children[1].children:
                     if method_node.attributes["value"]["type"] == "FunctionExpression":
-                        # handle node
-                        if method_node.children[0].attributes["name"] == name:
-                            return method_node
+                        # first method with this name, as a linear search would find
+                        index.setdefault(method_node.children[0].attributes["name"], method_node)
+    return index
+
+
+def find_page_method_node(root, name):
+    # the page methods are scanned once per page, not once per form
+    storage = Storage.get_instance()
+    if storage.method_index is None:
+        storage.method_index = build_page_method_index(root)
+    return storage.method_index.get(name)
 
 
 def tag_properties_to_page_method_param_ident_node(node, p):
@@ -30,29 +52,25 @@ def tag_properties_to_page_method_param_ident_node(node, p):
 
 
 def handle_form_properties(p):
-    root = Storage.get_instance().get_node()
+    root = Storage.get_instance().node
     node = find_page_method_node(root, p["bind_submit"])
     tag_properties_to_page_method_param_ident_node(node, p)
 
 
 def handle_wxml_form(element):
-    visited_elements_in_form = []
     form_properties = dict()
     # mapping: key name -> type
     form_properties["inputs"] = dict()
 
-    for e in element.iter():
-        visited_elements_in_form.append(e)
-
-        # handle form bind:submit
-        if e.tag == "g-form" or e.tag == "form":
-            if hasattr(e, "attrib") and "bind:submit" in e.attrib:
-                form_properties["bind_submit"] = e.attrib["bind:submit"]
-                continue
+    # tags are filtered by lxml: only the form and input elements come back to python
+    # handle form bind:submit
+    for e in element.iter("g-form", "form"):
+        if hasattr(e, "attrib") and "bind:submit" in e.attrib:
+            form_properties["bind_submit"] = e.attrib["bind:submit"]
 
-        # handle input properties
-        if (e.tag == "g-input" or e.tag == "input") and hasattr(e, "attrib") \
-                and ("name" in e.attrib or "id" in e.attrib):
+    # handle input properties
+    for e in element.iter("g-input", "input"):
+        if hasattr(e, "attrib") and ("name" in e.attrib or "id" in e.attrib):
             # handle password
             if "password" in e.attrib or ("type" in e.attrib and e.attrib["type"] == "safe-password"):
                 form_properties["inputs"][e.attrib["name"] if "name" in e.attrib else e.attrib["id"]] = "password"
@@ -65,32 +83,3 @@ def handle_wxml_form(element):
     # handle the properties
     if form_properties["bind_submit"] is not None:
         handle_form_properties(form_properties)
-    # return the visited elements in this form
-    return visited_elements_in_form
-
-
-def handle_wxml_element(element):
-    pass
-
-
-def visit_wxml_tree(r):
-    visited = []
-
-    def visit_node(v):
-        visited.append(v)
-        # handle form element
-        # as a form may have many child input elements
-        if hasattr(v, "tag") and (v.tag == "g-form" or v.tag == "form"):
-            # multiple elements are visited in handling form element
-            visited.extend(handle_wxml_form(v))
-            return
-
-        # handle normal xml element
-        handle_wxml_element(v)
-
-    # iter all the elements
-    for i in r.iter():
-        if i not in visited:
-            visit_node(i)
-
-
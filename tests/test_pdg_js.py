@@ -0,0 +1,142 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from pdg_js import js_operators
+from pdg_js import node as _node
+from pdg_js.build_pdg import get_data_flow
+
+PDG_JS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pdg_js")
+
+# Babel helper: subClass.prototype.constructor points back to subClass, i.e., a cyclic value
+INHERITS_LOOSE_JS = """
+function _inheritsLoose(subClass, superClass) {
+    subClass.prototype = Object.create(superClass.prototype);
+    subClass.prototype.constructor = subClass;
+    subClass.__proto__ = superClass;
+}
+var Parent = function Parent() {};
+var Child = /*#__PURE__*/function (_Parent) {
+    _inheritsLoose(Child, _Parent);
+    function Child() { return _Parent.apply(this, arguments) || this; }
+    return Child;
+}(Parent);
+"""
+
+
+def has_esprima():
+    if shutil.which("node") is None:
+        return False
+    return subprocess.run(["node", "-e", "require('esprima')"], cwd=PDG_JS_PATH,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+
+
+def pdg_of(js):
+    with tempfile.TemporaryDirectory() as tmp:
+        js_path = os.path.join(tmp, "test.js")
+        with open(js_path, "w") as f:
+            f.write(js)
+        benchmarks = {}
+        return get_data_flow(js_path, benchmarks, store_json=False), benchmarks
+
+
+def identifiers(pdg, name):
+    stack = [pdg]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children)
+        if node.kind == _node.KIND_IDENT and node.attributes.get("name") == name:
+            yield node
+
+
+def cyclic_value():
+    sub_class = {"prototype": {}}
+    sub_class["prototype"]["constructor"] = sub_class
+    return sub_class
+
+
+class SetValueTest(unittest.TestCase):
+    def test_cyclic_values_are_not_compared(self):
+        identifier = _node.Identifier("Identifier", _node.Node("Program"))
+        identifier.set_value(cyclic_value())
+        epoch = _node.Node.epoch
+        identifier.set_value(cyclic_value())  # Equal but distinct: comparing them never ends
+        self.assertGreater(_node.Node.epoch, epoch)
+
+    @unittest.skipUnless(has_esprima(), "node and esprima are required to parse JavaScript")
+    def test_inherits_loose(self):
+        pdg, benchmarks = pdg_of(INHERITS_LOOSE_JS)
+        self.assertEqual(pdg.name, "Program")
+        self.assertEqual(benchmarks["errors"], [])
+
+
+class ComputedValueCacheTest(unittest.TestCase):
+    def setUp(self):
+        js_operators.clear_caches()
+        root = _node.Node("Program")
+        self.binary = _node.Node("BinaryExpression", root)  # a + 2, does not store its value
+        self.binary.set_attribute("operator", "+")
+        root.set_child(self.binary)
+        self.identifier = _node.Identifier("Identifier", self.binary)
+        self.identifier.set_attribute("name", "a")
+        self.identifier.set_value(1)
+        self.binary.set_child(self.identifier)
+        literal = _node.ValueExpr("Literal", self.binary)
+        literal.set_attribute("value", 2)
+        literal.set_value(2)
+        self.binary.set_child(literal)
+
+    def test_cached_read(self):
+        self.assertEqual(js_operators.get_node_computed_value(self.binary), 3)
+        self.assertIn((self.binary, None, False), js_operators.COMPUTED_VALUE_CACHE)
+        self.assertEqual(js_operators.get_node_computed_value(self.binary), 3)
+
+    def test_mutation_invalidates_cached_read(self):
+        self.assertEqual(js_operators.get_node_computed_value(self.binary), 3)
+        self.identifier.set_value(5)
+        self.assertEqual(js_operators.get_node_computed_value(self.binary), 7)
+        self.binary.set_attribute("operator", "-")
+        self.assertEqual(js_operators.get_node_computed_value(self.binary), 3)
+
+    def test_mutable_values_are_not_cached(self):
+        member = _node.Node("MemberExpression", self.binary.parent)  # a.b, with a = {b: {c: 1}}
+        member.set_attribute("computed", False)
+        obj = _node.Identifier("Identifier", member)
+        obj.set_attribute("name", "a")
+        obj.set_value({"b": {"c": 1}})
+        member.set_child(obj)
+        prop = _node.Identifier("Identifier", member)
+        prop.set_attribute("name", "b")
+        member.set_child(prop)
+        self.assertEqual(js_operators.get_node_computed_value(member), {"c": 1})
+        self.assertNotIn((member, None, False), js_operators.COMPUTED_VALUE_CACHE)
+
+
+class CallExpressionTest(unittest.TestCase):
+    def add_identifier(self, name, parent):
+        identifier = _node.Identifier("Identifier", parent)
+        identifier.set_attribute("name", name)
+        parent.set_child(identifier)
+
+    def test_call_expression_callee(self):
+        # f(a)(b): the callee f(a) is evaluated once, not again from recvisited
+        call = _node.ValueExpr("CallExpression", _node.Node("Program"))
+        callee = _node.ValueExpr("CallExpression", call)
+        call.set_child(callee)
+        self.add_identifier("f", callee)
+        self.add_identifier("a", callee)
+        self.add_identifier("b", call)
+        self.assertEqual(js_operators.get_node_computed_value(call), "f(a)(b)")
+
+    @unittest.skipUnless(has_esprima(), "node and esprima are required to parse JavaScript")
+    def test_call_expression_callee_property(self):
+        pdg, benchmarks = pdg_of("var m = {};\nm.c = f(a)(b);\n")
+        self.assertEqual(benchmarks["errors"], [])
+        values = [m.value for m in identifiers(pdg, "m") if isinstance(m.value, dict)]
+        self.assertEqual(values, [{"c": "f(a)(b)"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
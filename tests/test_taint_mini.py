@@ -0,0 +1,56 @@
+import unittest
+
+from taint_mini.taintmini import filter_results
+from taint_mini.wxjs import Flow
+
+DOUBLE_BINDING = "[data from double binding: uname, type: text]"
+
+RESULTS = {
+    "pages/index/index": [
+        Flow("onLoad", "token", "wx.getStorageSync", "wx.request"),
+        Flow("onLoad", "info", "wx.getUserInfo", "wx.setStorageSync"),
+    ],
+    "pages/form/form": [
+        Flow("formSubmit", "name", DOUBLE_BINDING, "wx.request"),
+        Flow("formSubmit", "v", "[data from page parameter: e.detail.value]", "wx.navigateTo"),
+    ],
+    "pages/empty/empty": [],
+}
+
+
+class FilterResultsTest(unittest.TestCase):
+    def test_no_filters(self):
+        self.assertIs(filter_results(RESULTS, {}), RESULTS)
+        self.assertIs(filter_results(RESULTS, {"sources": [], "sinks": []}), RESULTS)
+
+    def test_sources_only(self):
+        self.assertEqual(filter_results(RESULTS, {"sources": ["wx.getUserInfo"]}), {
+            "pages/index/index": [Flow("onLoad", "info", "wx.getUserInfo", "wx.setStorageSync")],
+        })
+
+    def test_sinks_only(self):
+        self.assertEqual(filter_results(RESULTS, {"sinks": ["wx.request"]}), {
+            "pages/index/index": [Flow("onLoad", "token", "wx.getStorageSync", "wx.request")],
+            "pages/form/form": [Flow("formSubmit", "name", DOUBLE_BINDING, "wx.request")],
+        })
+
+    def test_sources_and_sinks(self):
+        config = {"sources": ["wx.getStorageSync", "wx.getUserInfo"], "sinks": ["wx.request"]}
+        self.assertEqual(filter_results(RESULTS, config), {
+            "pages/index/index": [Flow("onLoad", "token", "wx.getStorageSync", "wx.request")],
+        })
+
+    def test_double_binding(self):
+        # any "[data from" source matches, the one also listed explicitly is still kept once
+        config = {"sources": ["[double_binding]", DOUBLE_BINDING]}
+        self.assertEqual(filter_results(RESULTS, config), {"pages/form/form": RESULTS["pages/form/form"]})
+        config["sinks"] = ["wx.request"]
+        self.assertEqual(filter_results(RESULTS, config), {
+            "pages/form/form": [Flow("formSubmit", "name", DOUBLE_BINDING, "wx.request")],
+        })
+        config["sinks"] = ["wx.setStorageSync"]
+        self.assertEqual(filter_results(RESULTS, config), {})
+
+
+if __name__ == "__main__":
+    unittest.main()